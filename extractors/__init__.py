@@ -3,7 +3,7 @@ Extractor modules for MSP Extractor - Each category has its own extractor
 """
 # Only import what's working for now
 try:
-    from .base_extractor import BaseExtractor
+    from .base_extractor import BaseExtractor, extract_corpus
     from .distance_extractor import DistanceExtractor
 except ImportError:
     # Fallback for direct imports
@@ -11,5 +11,6 @@ except ImportError:
 
 __all__ = [
     'BaseExtractor',
+    'extract_corpus',
     'DistanceExtractor',
 ]
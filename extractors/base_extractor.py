@@ -2,7 +2,9 @@
 Base extractor class - all extractors inherit from this
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
 import re
 import logging
 
@@ -49,6 +51,53 @@ def _get_nlp_filter():
     return _shared_nlp_filter
 
 
+# Per-process extractor used by extract_corpus() workers
+_worker_extractor = None
+
+
+def _init_worker(extractor_cls):
+    """Build one extractor per worker process so patterns compile only once."""
+    global _worker_extractor
+    try:
+        from ..utils import (
+            MSPKeywords, TurkishLegalSentenceSegmenter, FalsePositiveFilter,
+            LegalReferenceFilter, MultilingualNumberConverter,
+        )
+    except ImportError:
+        from utils import (
+            MSPKeywords, TurkishLegalSentenceSegmenter, FalsePositiveFilter,
+            LegalReferenceFilter, MultilingualNumberConverter,
+        )
+    _worker_extractor = extractor_cls(
+        MSPKeywords(), TurkishLegalSentenceSegmenter(), FalsePositiveFilter(),
+        LegalReferenceFilter(), MultilingualNumberConverter(),
+    )
+
+
+def _worker_extract(doc: Tuple[str, Dict[int, str], DocumentType]) -> List:
+    text, page_texts, doc_type = doc
+    return _worker_extractor.extract(text, page_texts, doc_type)
+
+
+def extract_corpus(extractor_cls, docs: Iterable[Tuple[str, Dict[int, str], DocumentType]],
+                   max_workers: Optional[int] = None) -> List[List]:
+    """
+    Run one extractor over many documents in parallel worker processes.
+
+    Args:
+        extractor_cls: BaseExtractor subclass to instantiate in each worker
+        docs: Iterable of (text, page_texts, doc_type) tuples
+        max_workers: Number of processes (default: os.cpu_count())
+
+    Returns:
+        List of per-document extraction lists, in input order
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             initializer=_init_worker,
+                             initargs=(extractor_cls,)) as executor:
+        return list(executor.map(_worker_extract, docs))
+
+
 class BaseExtractor(ABC):
     """Base class for all extractors"""
 
@@ -287,8 +336,12 @@ class BaseExtractor(ABC):
             return 'facility'
         return 'reference_point'
 
-    def _deduplicate(self, results: List) -> List:
-        """Remove duplicate extractions based on extraction_hash"""
+    def _deduplicate(self, results: Iterable) -> List:
+        """Remove duplicate extractions based on extraction_hash.
+
+        Accepts any iterable, so extractors can stream matches from a
+        generator and filter them in a single pass.
+        """
         seen = set()
         deduplicated = []
 
@@ -4,7 +4,7 @@ Extracts stakeholder mentions (institutions, communities, organizations)
 """
 import re
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 try:
     from ..core.enums import DocumentType
@@ -17,6 +17,32 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# English stakeholder-group alternatives. Shared by the Python regex and the
+# optional Hyperscan database so both paths match the same phrases.
+ENGLISH_ROLE_ALTERNATIVES = (
+    r'local\s+(?:community|communities|fishers?|fishermen)',
+    r'fishing\s+(?:community|communities|industry)',
+    r'coastal\s+(?:community|communities)',
+    r'indigenous\s+(?:community|communities|peoples?)',
+    r'tourism\s+(?:industry|sector|operators?)',
+    r'shipping\s+(?:industry|sector|companies)',
+    r'oil\s+and\s+gas\s+(?:industry|sector|companies)',
+    r'offshore\s+(?:wind|energy)\s+(?:industry|sector|developers?)',
+    r'environmental\s+(?:NGOs?|organizations?)',
+    r'conservation\s+(?:NGOs?|organizations?)',
+    r'government\s+(?:agencies|authorities|bodies)',
+    r'port\s+authorities',
+    r'maritime\s+(?:industry|sector|authorities)',
+    r'aquaculture\s+(?:industry|sector|farmers?)',
+    r'recreational\s+(?:users?|fishers?|boaters?)',
+)
+
 
 class StakeholderExtractor(BaseExtractor):
     """Extract stakeholder mentions from MSP documents"""
@@ -71,42 +97,83 @@ class StakeholderExtractor(BaseExtractor):
             ),
             # Specific stakeholder group patterns
             re.compile(
-                r'(?P<role>local\s+(?:community|communities|fishers?|fishermen)|'
-                r'fishing\s+(?:community|communities|industry)|'
-                r'coastal\s+(?:community|communities)|'
-                r'indigenous\s+(?:community|communities|peoples?)|'
-                r'tourism\s+(?:industry|sector|operators?)|'
-                r'shipping\s+(?:industry|sector|companies)|'
-                r'oil\s+and\s+gas\s+(?:industry|sector|companies)|'
-                r'offshore\s+(?:wind|energy)\s+(?:industry|sector|developers?)|'
-                r'environmental\s+(?:NGOs?|organizations?)|'
-                r'conservation\s+(?:NGOs?|organizations?)|'
-                r'government\s+(?:agencies|authorities|bodies)|'
-                r'port\s+authorities|'
-                r'maritime\s+(?:industry|sector|authorities)|'
-                r'aquaculture\s+(?:industry|sector|farmers?)|'
-                r'recreational\s+(?:users?|fishers?|boaters?))',
+                r'(?P<role>' + '|'.join(ENGLISH_ROLE_ALTERNATIVES) + r')',
                 re.IGNORECASE
             ),
             # REMOVED: Generic "stakeholders" pattern - too many false positives
             # Only capture specific stakeholder groups, not the generic word
         ]
+        self._role_pattern = self.english_patterns[1]
+        self._role_db = self._build_role_database()
+
+    def _build_role_database(self):
+        """Compile the role alternatives into a Hyperscan database, if available"""
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        try:
+            db = hyperscan.Database()
+            n = len(ENGLISH_ROLE_ALTERNATIVES)
+            db.compile(
+                expressions=[p.encode() for p in ENGLISH_ROLE_ALTERNATIVES],
+                ids=list(range(n)),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * n,
+            )
+            return db
+        except Exception as e:
+            logger.warning(f"Hyperscan role database unavailable, using regex: {e}")
+            return None
+
+    def _iter_role_matches(self, text: str) -> Iterator[re.Match]:
+        """
+        Find stakeholder-group matches, using Hyperscan to locate candidates.
+
+        Hyperscan reports every (possibly overlapping) hit; the Python pattern
+        is re-anchored at each candidate start so callers still receive
+        re.Match objects with the same leftmost, non-overlapping semantics as
+        finditer(). Byte offsets equal str offsets only for ASCII text, so
+        anything else takes the pure-Python path.
+        """
+        if self._role_db is None or not text.isascii():
+            yield from self._role_pattern.finditer(text)
+            return
+
+        starts = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            starts.add(start)
+
+        self._role_db.scan(text.encode('ascii'), match_event_handler=on_match)
+
+        pos = 0
+        for start in sorted(starts):
+            if start < pos:
+                continue
+            match = self._role_pattern.match(text, start)
+            if match:
+                yield match
+                pos = match.end()
 
     def extract(self, text: str, page_texts: Dict[int, str],
                 doc_type: DocumentType) -> List[StakeholderExtraction]:
         """Extract stakeholders from text"""
-        results: List[StakeholderExtraction] = []
+        return self._deduplicate(self._iter_matches(text, page_texts, doc_type))
+
+    def _iter_matches(self, text: str, page_texts: Dict[int, str],
+                      doc_type: DocumentType) -> Iterator[StakeholderExtraction]:
+        """Yield processed stakeholder matches without materialising a list"""
         language = self._get_language(doc_type)
 
         patterns = self.turkish_patterns if language == "turkish" else self.english_patterns
 
         for pattern in patterns:
-            for match in pattern.finditer(text):
+            if pattern is self._role_pattern:
+                matches = self._iter_role_matches(text)
+            else:
+                matches = pattern.finditer(text)
+            for match in matches:
                 result = self._process_match(match, text, text, page_texts, language, doc_type)
                 if result:
-                    results.append(result)
-
-        return self._deduplicate(results)
+                    yield result
 
     def _process_match(self, match: re.Match, converted_text: str, original_text: str,
                        page_texts: Dict[int, str], language: str,
@@ -0,0 +1,48 @@
+"""
+Shared helpers for gap detectors - loading and normalizing extractions.
+"""
+
+import json
+from typing import Dict, Iterable, List
+
+
+def normalize(ext: Dict) -> Dict:
+    """
+    Ensure ``ext['metadata']`` is a dict.
+
+    JSON strings are parsed once and the result is stored back on the
+    extraction, so detectors can read ``ext['metadata']`` directly.
+    """
+    metadata = ext.get('metadata')
+    if isinstance(metadata, dict):
+        return ext
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except (json.JSONDecodeError, TypeError):
+            metadata = {}
+    if not isinstance(metadata, dict):
+        metadata = {}
+    ext['metadata'] = metadata
+    return ext
+
+
+def context_lower(ext: Dict) -> str:
+    """Lowercased context of an extraction, computed once and cached on it."""
+    ctx = ext.get('_context_lower')
+    if ctx is None:
+        ctx = (ext.get('context') or ext['metadata'].get('context') or '').lower()
+        ext['_context_lower'] = ctx
+    return ctx
+
+
+def query(kb, category: str) -> List[Dict]:
+    """Query one category from the knowledge base with normalized metadata."""
+    if not hasattr(kb, 'query_extractions'):
+        return []
+    return [normalize(ext) for ext in kb.query_extractions(category=category)]
+
+
+def load_extractions(kb, categories: Iterable[str]) -> Dict[str, List[Dict]]:
+    """Query each category from the knowledge base exactly once."""
+    return {cat: query(kb, cat) for cat in categories}
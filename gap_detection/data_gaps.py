@@ -5,9 +5,18 @@ Data gap detection - identifies missing, outdated, or insufficient data.
 from typing import Dict, List
 from collections import Counter
 
-import sys
-sys.path.insert(0, str(__import__('pathlib').Path(__file__).parent.parent))
-from data_structures.integrated import Gap
+try:
+    from ..data_structures.integrated import Gap
+except ImportError:
+    from data_structures.integrated import Gap
+
+from .common import query
+
+
+def _has_any(ext: Dict, *keys: str) -> bool:
+    """True if any key is set on the extraction or in its metadata."""
+    md = ext.get('metadata') or {}
+    return any(ext.get(k) or md.get(k) for k in keys)
 
 
 class DataGapDetector:
@@ -25,10 +34,10 @@ class DataGapDetector:
         """Find essential data types that are not available."""
         gaps = []
 
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
+        data_sources = query(kb, 'data_source')
         available_types = set()
         for ext in data_sources:
-            source_type = ext.get('source_type', ext.get('metadata', {}).get('source_type', ''))
+            source_type = ext.get('source_type') or ext['metadata'].get('source_type', '')
             if source_type:
                 available_types.add(source_type.lower())
 
@@ -62,12 +71,11 @@ class DataGapDetector:
         """Find areas with insufficient spatial or temporal coverage."""
         gaps = []
 
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
+        data_sources = query(kb, 'data_source')
 
         sources_without_coverage = [
             ext for ext in data_sources
-            if not ext.get('spatial_coverage', ext.get('metadata', {}).get('spatial_coverage'))
-            and not ext.get('temporal_coverage', ext.get('metadata', {}).get('temporal_coverage'))
+            if not _has_any(ext, 'spatial_coverage', 'temporal_coverage')
         ]
 
         if sources_without_coverage and len(data_sources) > 0:
@@ -89,11 +97,11 @@ class DataGapDetector:
         """Find data with insufficient resolution for MSP needs."""
         gaps = []
 
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
+        data_sources = query(kb, 'data_source')
 
         sources_without_resolution = [
             ext for ext in data_sources
-            if not ext.get('resolution', ext.get('metadata', {}).get('resolution'))
+            if not _has_any(ext, 'resolution')
         ]
 
         if sources_without_resolution and len(data_sources) > 0:
@@ -6,86 +6,168 @@ disconnects between what research says, what laws require,
 and what data is available.
 """
 
-from typing import Dict, List
-from collections import defaultdict
-
-import sys
-sys.path.insert(0, str(__import__('pathlib').Path(__file__).parent.parent))
-from data_structures.integrated import Gap
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+from collections import Counter, defaultdict
+
+try:
+    from ..data_structures.integrated import Gap
+except ImportError:
+    from data_structures.integrated import Gap
+
+from .common import context_lower, load_extractions
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Data source access types that count as a barrier to reuse
+RESTRICTED_ACCESS = frozenset({'restricted', 'proprietary'})
+
+# Legal data requirements and the keywords that signal each one
+DATA_REQUIRING_TERMS = {
+    'EIA': frozenset({'environmental', 'ecological', 'biodiversity'}),
+    'socioeconomic': frozenset({'socioeconomic', 'economic', 'social'}),
+    'bathymetric': frozenset({'bathymetry', 'depth', 'seabed'}),
+    'hydrographic': frozenset({'hydrographic', 'current', 'tide'}),
+}
+
+
+def _token_ngrams(texts: Iterable[str], sizes: Iterable[int]) -> Set[str]:
+    """Space-joined word n-grams of each of ``texts`` for each n in ``sizes``.
+
+    Texts are tokenized one at a time, so n-grams never span two texts and
+    no joined copy of the whole corpus is built.
+    """
+    sizes = tuple(sizes)
+    grams = set()
+    for text in texts:
+        tokens = _TOKEN_RE.findall(text)
+        for n in sizes:
+            grams.update(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+@dataclass
+class NameIndex:
+    """Lowercased species and MPA names, built once per detection run."""
+    species_doc_count: Counter = field(default_factory=Counter)
+    species_docs: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    species_protection: Dict[str, str] = field(default_factory=dict)
+    mpa_names: Set[str] = field(default_factory=set)
+
+
+def _build_name_index(by_cat: Dict[str, List[Dict]]) -> NameIndex:
+    """Index species and protected area names in a single pass over each category."""
+    idx = NameIndex()
+
+    # Distinct-document count per species, plus the first 10 doc ids
+    seen = set()
+    for ext in by_cat.get('species', ()):
+        metadata = ext['metadata']
+        name = ext.get('species_name') or metadata.get('species_name', '')
+        if not name:
+            continue
+        name_lower = name.lower().strip()
+        key = (name_lower, str(ext.get('document_id', ext.get('source_file', ''))))
+        if key not in seen:
+            seen.add(key)
+            idx.species_doc_count[name_lower] += 1
+            if len(idx.species_docs[name_lower]) < 10:
+                idx.species_docs[name_lower].append(key[1])
+        protection = ext.get('protection_status') or metadata.get('protection_status')
+        if protection:
+            idx.species_protection[name_lower] = protection
+
+    for ext in by_cat.get('protected_area', ()):
+        name = ext.get('name') or ext['metadata'].get('name', '')
+        if name:
+            idx.mpa_names.add(name.lower().strip())
+
+    return idx
 
 
 class IntegrationGapDetector:
     """Detect gaps ACROSS research, legal, and data sources"""
 
+    # Extraction categories read by the detectors below
+    CATEGORIES = (
+        'species', 'permit', 'data_source', 'method', 'legal_reference',
+        'protected_area', 'finding', 'policy',
+    )
+
     def detect_all(self, knowledge_base) -> List[Gap]:
-        """Run all integration gap detection methods."""
+        """Run all integration gap detection methods.
+
+        Each category is queried once and shared across the detectors.
+        """
+        by_cat = load_extractions(knowledge_base, self.CATEGORIES)
+        idx = _build_name_index(by_cat)
         gaps = []
-        gaps.extend(self.detect_unprotected_important_species(knowledge_base))
-        gaps.extend(self.detect_legal_data_mismatch(knowledge_base))
-        gaps.extend(self.detect_method_legal_disconnect(knowledge_base))
-        gaps.extend(self.detect_unmonitored_mpas(knowledge_base))
-        gaps.extend(self.detect_data_access_barriers(knowledge_base))
-        gaps.extend(self.detect_research_policy_disconnect(knowledge_base))
+        gaps.extend(self._detect_unprotected_important_species(idx))
+        gaps.extend(self._detect_legal_data_mismatch(by_cat))
+        gaps.extend(self._detect_method_legal_disconnect(by_cat))
+        gaps.extend(self._detect_unmonitored_mpas(by_cat, idx))
+        gaps.extend(self._detect_data_access_barriers(by_cat))
+        gaps.extend(self._detect_research_policy_disconnect(by_cat))
         return gaps
 
     def detect_unprotected_important_species(self, kb) -> List[Gap]:
-        """
-        GAP TYPE 1: Research says species is important, but no legal protection.
+        """GAP TYPE 1, run on its own against the knowledge base."""
+        by_cat = load_extractions(kb, ('species',))
+        return self._detect_unprotected_important_species(_build_name_index(by_cat))
 
-        Find species that are:
-        - Frequently mentioned in research (>= 3 papers)
-        - BUT have no legal protection status
-        """
-        gaps = []
+    def detect_legal_data_mismatch(self, kb) -> List[Gap]:
+        """GAP TYPE 2, run on its own against the knowledge base."""
+        return self._detect_legal_data_mismatch(load_extractions(kb, ('permit', 'data_source')))
 
-        # Get species from research papers (scientific documents)
-        species_extractions = kb.query_extractions(category='species') if hasattr(kb, 'query_extractions') else []
+    def detect_method_legal_disconnect(self, kb) -> List[Gap]:
+        """GAP TYPE 3, run on its own against the knowledge base."""
+        return self._detect_method_legal_disconnect(load_extractions(kb, ('method', 'legal_reference')))
 
-        species_by_doc = defaultdict(set)
-        species_protection = {}
+    def detect_unmonitored_mpas(self, kb) -> List[Gap]:
+        """GAP TYPE 4, run on its own against the knowledge base."""
+        by_cat = load_extractions(kb, ('protected_area', 'data_source'))
+        return self._detect_unmonitored_mpas(by_cat, _build_name_index(by_cat))
 
-        for ext in species_extractions:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
+    def detect_data_access_barriers(self, kb) -> List[Gap]:
+        """GAP TYPE 5, run on its own against the knowledge base."""
+        return self._detect_data_access_barriers(load_extractions(kb, ('data_source',)))
 
-            name = ext.get('species_name', metadata.get('species_name', ''))
-            doc_id = ext.get('document_id', ext.get('source_file', ''))
-            protection = ext.get('protection_status', metadata.get('protection_status'))
+    def detect_research_policy_disconnect(self, kb) -> List[Gap]:
+        """GAP TYPE 6, run on its own against the knowledge base."""
+        return self._detect_research_policy_disconnect(load_extractions(kb, ('finding', 'policy')))
 
-            if name:
-                name_lower = name.lower().strip()
-                species_by_doc[name_lower].add(str(doc_id))
-                if protection:
-                    species_protection[name_lower] = protection
+    def _detect_unprotected_important_species(self, idx: 'NameIndex') -> List[Gap]:
+        """
+        GAP TYPE 1: Research says species is important, but no legal protection.
 
+        Find species that are:
+        - Frequently mentioned in research (>= 3 papers)
+        - BUT have no legal protection status
+        """
         # Find frequently mentioned but unprotected species
-        for species_name, docs in species_by_doc.items():
-            if len(docs) >= 3 and species_name not in species_protection:
-                gaps.append(Gap(
-                    gap_category='integration',
-                    gap_type='unprotected_important_species',
-                    severity='critical',
-                    description=(
-                        f"Species '{species_name}' mentioned in {len(docs)} documents "
-                        f"but no legal protection status found"
-                    ),
-                    impact=f"'{species_name}' may be at risk despite research interest",
-                    recommendation=f"Assess conservation status of '{species_name}' and consider legal protection",
-                    evidence=[
-                        f"Mentioned in {len(docs)} documents",
-                        "No protection status extracted from legal documents",
-                    ],
-                    source_documents=list(docs)[:10],
-                ))
-
-        return gaps
+        return [
+            Gap(
+                gap_category='integration',
+                gap_type='unprotected_important_species',
+                severity='critical',
+                description=(
+                    f"Species '{species_name}' mentioned in {count} documents "
+                    f"but no legal protection status found"
+                ),
+                impact=f"'{species_name}' may be at risk despite research interest",
+                recommendation=f"Assess conservation status of '{species_name}' and consider legal protection",
+                evidence=[
+                    f"Mentioned in {count} documents",
+                    "No protection status extracted from legal documents",
+                ],
+                source_documents=idx.species_docs[species_name],
+            )
+            for species_name, count in idx.species_doc_count.items()
+            if count >= 3 and species_name not in idx.species_protection
+        ]
 
-    def detect_legal_data_mismatch(self, kb) -> List[Gap]:
+    def _detect_legal_data_mismatch(self, by_cat: Dict[str, List[Dict]]) -> List[Gap]:
         """
         GAP TYPE 2: Laws require certain data/analysis that doesn't exist.
 
@@ -94,40 +176,23 @@ class IntegrationGapDetector:
         gaps = []
 
         # Get legal requirements (permits, environmental thresholds)
-        permits = kb.query_extractions(category='permit') if hasattr(kb, 'query_extractions') else []
-        env_reqs = kb.query_extractions(category='environmental') if hasattr(kb, 'query_extractions') else []
+        permits = by_cat['permit']
 
         # Get available data types
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
+        data_sources = by_cat['data_source']
         available_data = set()
         for ext in data_sources:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
-            source_type = ext.get('source_type', metadata.get('source_type', ''))
+            metadata = ext['metadata']
+            source_type = ext.get('source_type') or metadata.get('source_type', '')
             if source_type:
                 available_data.add(source_type.lower())
 
-        # Check if permits require data we don't have
-        data_requiring_terms = {
-            'EIA': ['environmental', 'ecological', 'biodiversity'],
-            'socioeconomic': ['socioeconomic', 'economic', 'social'],
-            'bathymetric': ['bathymetry', 'depth', 'seabed'],
-            'hydrographic': ['hydrographic', 'current', 'tide'],
-        }
+        # Check if permits require data we don't have.
+        permit_ctxs = [ctx for ctx in map(context_lower, permits) if ctx]
 
-        for req_type, keywords in data_requiring_terms.items():
+        for req_type, keywords in DATA_REQUIRING_TERMS.items():
             # Check if any permit mentions this requirement
-            requires_it = False
-            for ext in permits:
-                context = ext.get('context', ext.get('metadata', {}).get('context', '') if isinstance(ext.get('metadata'), dict) else '')
-                if context and any(kw in context.lower() for kw in keywords):
-                    requires_it = True
-                    break
+            requires_it = any(kw in ctx for ctx in permit_ctxs for kw in keywords)
 
             if requires_it:
                 has_data = any(kw in t for kw in keywords for t in available_data)
@@ -147,118 +212,83 @@ class IntegrationGapDetector:
 
         return gaps
 
-    def detect_method_legal_disconnect(self, kb) -> List[Gap]:
+    def _detect_method_legal_disconnect(self, by_cat: Dict[str, List[Dict]]) -> List[Gap]:
         """
         GAP TYPE 3: Research recommends methods not legally mandated.
 
         Find methods frequently used in research that are not
         required or referenced in legal documents.
         """
-        gaps = []
-
-        methods = kb.query_extractions(category='method') if hasattr(kb, 'query_extractions') else []
-        legal_refs = kb.query_extractions(category='legal_reference') if hasattr(kb, 'query_extractions') else []
+        methods = by_cat['method']
+        legal_refs = by_cat['legal_reference']
 
         # Count method types used in research
-        method_counts = defaultdict(int)
-        for ext in methods:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
-            method_type = ext.get('method_type', metadata.get('method_type', 'unknown'))
-            method_counts[method_type] += 1
-
-        # Check which methods are mentioned in legal context
-        legal_contexts = ' '.join(
-            ext.get('context', ext.get('metadata', {}).get('context', '') if isinstance(ext.get('metadata'), dict) else '')
-            for ext in legal_refs
-        ).lower()
-
-        for method_type, count in method_counts.items():
-            if count >= 5 and method_type not in legal_contexts:
-                gaps.append(Gap(
-                    gap_category='integration',
-                    gap_type='method_legal_disconnect',
-                    severity='important',
-                    description=f"Method '{method_type}' used in {count} research papers but not referenced in legal framework",
-                    impact=f"Research best practice ({method_type}) not codified in regulations",
-                    recommendation=f"Consider incorporating {method_type} requirements into MSP regulations",
-                    evidence=[f"Used in {count} research papers", "Not found in legal documents"],
-                ))
-
-        return gaps
-
-    def detect_unmonitored_mpas(self, kb) -> List[Gap]:
+        method_counts = Counter(
+            ext.get('method_type') or ext['metadata'].get('method_type', 'unknown')
+            for ext in methods
+        )
+
+        # Check which methods are mentioned in legal context, comparing
+        # method types as token sequences against the legal-context n-grams
+        method_keys = {m: ' '.join(_TOKEN_RE.findall(str(m).lower())) for m in method_counts}
+        legal_grams = _token_ngrams(map(context_lower, legal_refs), {key.count(' ') + 1 for key in method_keys.values()})
+
+        return [
+            Gap(
+                gap_category='integration',
+                gap_type='method_legal_disconnect',
+                severity='important',
+                description=f"Method '{method_type}' used in {count} research papers but not referenced in legal framework",
+                impact=f"Research best practice ({method_type}) not codified in regulations",
+                recommendation=f"Consider incorporating {method_type} requirements into MSP regulations",
+                evidence=[f"Used in {count} research papers", "Not found in legal documents"],
+            )
+            for method_type, count in method_counts.items()
+            if count >= 5 and method_keys[method_type] not in legal_grams
+        ]
+
+    def _detect_unmonitored_mpas(self, by_cat: Dict[str, List[Dict]], idx: 'NameIndex') -> List[Gap]:
         """
         GAP TYPE 4: MPAs designated but no monitoring data available.
         """
-        gaps = []
+        data_sources = by_cat['data_source']
+        mpa_names = idx.mpa_names
 
-        mpas = kb.query_extractions(category='protected_area') if hasattr(kb, 'query_extractions') else []
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
-
-        mpa_names = set()
-        for ext in mpas:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
-            name = ext.get('name', metadata.get('name', ''))
-            if name:
-                mpa_names.add(name.lower().strip())
-
-        # Check if any data source references these MPAs
-        data_contexts = ' '.join(
-            ext.get('context', ext.get('metadata', {}).get('context', '') if isinstance(ext.get('metadata'), dict) else '')
-            for ext in data_sources
-        ).lower()
-
-        for mpa_name in mpa_names:
-            if mpa_name not in data_contexts:
-                gaps.append(Gap(
-                    gap_category='integration',
-                    gap_type='unmonitored_mpa',
-                    severity='critical',
-                    description=f"MPA '{mpa_name}' designated but no monitoring data found",
-                    impact=f"Cannot assess effectiveness of protection for '{mpa_name}'",
-                    recommendation=f"Establish monitoring program for '{mpa_name}'",
-                    evidence=[
-                        f"MPA '{mpa_name}' found in legal documents",
-                        "No monitoring data source references this MPA",
-                    ],
-                ))
+        # Check if any data source references these MPAs. Names are compared
+        # as token sequences against the n-grams of the data contexts.
+        name_keys = {name: ' '.join(_TOKEN_RE.findall(name)) for name in mpa_names}
+        data_grams = _token_ngrams(map(context_lower, data_sources), {key.count(' ') + 1 for key in name_keys.values()})
 
-        return gaps
+        return [
+            Gap(
+                gap_category='integration',
+                gap_type='unmonitored_mpa',
+                severity='critical',
+                description=f"MPA '{mpa_name}' designated but no monitoring data found",
+                impact=f"Cannot assess effectiveness of protection for '{mpa_name}'",
+                recommendation=f"Establish monitoring program for '{mpa_name}'",
+                evidence=[
+                    f"MPA '{mpa_name}' found in legal documents",
+                    "No monitoring data source references this MPA",
+                ],
+            )
+            for mpa_name in mpa_names
+            if name_keys[mpa_name] not in data_grams
+        ]
 
-    def detect_data_access_barriers(self, kb) -> List[Gap]:
+    def _detect_data_access_barriers(self, by_cat: Dict[str, List[Dict]]) -> List[Gap]:
         """
         GAP TYPE 5: Research uses data that's not publicly available.
         """
         gaps = []
 
-        data_sources = kb.query_extractions(category='data_source') if hasattr(kb, 'query_extractions') else []
+        data_sources = by_cat['data_source']
 
-        restricted_count = 0
         total_count = len(data_sources)
-
-        for ext in data_sources:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
-            access = ext.get('access_type', metadata.get('access_type', 'unknown'))
-            if access in ('restricted', 'proprietary'):
-                restricted_count += 1
+        restricted_count = sum(
+            1 for ext in data_sources
+            if (ext.get('access_type') or ext['metadata'].get('access_type', 'unknown')) in RESTRICTED_ACCESS
+        )
 
         if restricted_count > 0 and total_count > 0:
             pct = restricted_count / total_count * 100
@@ -275,26 +305,20 @@ class IntegrationGapDetector:
 
         return gaps
 
-    def detect_research_policy_disconnect(self, kb) -> List[Gap]:
+    def _detect_research_policy_disconnect(self, by_cat: Dict[str, List[Dict]]) -> List[Gap]:
         """
         GAP TYPE 6: Research conclusions/recommendations not reflected in policy.
         """
         gaps = []
 
         # Get research conclusions with policy implications
-        findings = kb.query_extractions(category='finding') if hasattr(kb, 'query_extractions') else []
-        policies = kb.query_extractions(category='policy') if hasattr(kb, 'query_extractions') else []
+        findings = by_cat['finding']
+        policies = by_cat['policy']
 
         recommendation_count = 0
         for ext in findings:
-            metadata = ext.get('metadata', {})
-            if isinstance(metadata, str):
-                import json
-                try:
-                    metadata = json.loads(metadata)
-                except (json.JSONDecodeError, TypeError):
-                    metadata = {}
-            finding_type = ext.get('finding_type', metadata.get('finding_type', ''))
+            metadata = ext['metadata']
+            finding_type = ext.get('finding_type') or metadata.get('finding_type', '')
             if finding_type == 'recommendation':
                 recommendation_count += 1
 
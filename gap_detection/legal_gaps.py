@@ -5,12 +5,24 @@ Detects missing regulations, conflicting requirements, weak enforcement,
 and areas where legal frameworks are incomplete.
 """
 
+import re
 from typing import Dict, List
 from collections import Counter, defaultdict
 
-import sys
-sys.path.insert(0, str(__import__('pathlib').Path(__file__).parent.parent))
-from data_structures.integrated import Gap
+try:
+    from ..data_structures.integrated import Gap
+except ImportError:
+    from data_structures.integrated import Gap
+
+from .common import context_lower, query
+
+# MSP activities looked for in research contexts. Matched as plain
+# substrings (no word boundaries), one alternation scan per context.
+RESEARCH_ACTIVITIES = (
+    'aquaculture', 'fishing', 'shipping', 'tourism', 'offshore_energy',
+    'dredging', 'mining', 'conservation', 'military',
+)
+_ACTIVITY_RE = re.compile('|'.join(a.replace('_', ' ') for a in RESEARCH_ACTIVITIES))
 
 
 class LegalGapDetector:
@@ -27,65 +39,58 @@ class LegalGapDetector:
 
     def detect_unregulated_activities(self, kb) -> List[Gap]:
         """Find MSP activities without corresponding regulations."""
-        gaps = []
-
         # Get all activities mentioned in research
         research_activities = set()
         for cat in ['method', 'finding', 'conflict', 'stakeholder']:
-            extractions = kb.query_extractions(category=cat) if hasattr(kb, 'query_extractions') else []
+            extractions = query(kb, cat)
             for ext in extractions:
-                context = ext.get('context', ext.get('metadata', {}).get('context', ''))
-                if context:
-                    context_lower = context.lower()
-                    for activity in ['aquaculture', 'fishing', 'shipping', 'tourism',
-                                     'offshore_energy', 'dredging', 'mining',
-                                     'conservation', 'military']:
-                        if activity.replace('_', ' ') in context_lower:
-                            research_activities.add(activity)
+                research_activities.update(
+                    m.replace(' ', '_') for m in _ACTIVITY_RE.findall(context_lower(ext))
+                )
 
         # Get activities that have legal requirements
         regulated_activities = set()
         for cat in ['prohibition', 'permit', 'distance', 'penalty']:
-            extractions = kb.query_extractions(category=cat) if hasattr(kb, 'query_extractions') else []
+            extractions = query(kb, cat)
             for ext in extractions:
-                activity = ext.get('activity', ext.get('metadata', {}).get('activity', ''))
+                activity = ext.get('activity') or ext['metadata'].get('activity', '')
                 if activity:
                     regulated_activities.add(activity.lower())
 
         # Find gaps
-        for activity in research_activities:
-            if activity not in regulated_activities:
-                gaps.append(Gap(
-                    gap_category='legal',
-                    gap_type='unregulated_activity',
-                    severity='critical',
-                    description=f"Activity '{activity}' discussed in research but no regulations found",
-                    impact=f"No legal framework for managing {activity}",
-                    recommendation=f"Develop regulations for {activity} activities",
-                    evidence=[
-                        f"Activity found in research papers",
-                        f"No matching prohibition, permit, or distance requirement found"
-                    ],
-                ))
-
-        return gaps
+        return [
+            Gap(
+                gap_category='legal',
+                gap_type='unregulated_activity',
+                severity='critical',
+                description=f"Activity '{activity}' discussed in research but no regulations found",
+                impact=f"No legal framework for managing {activity}",
+                recommendation=f"Develop regulations for {activity} activities",
+                evidence=[
+                    f"Activity found in research papers",
+                    f"No matching prohibition, permit, or distance requirement found"
+                ],
+            )
+            for activity in research_activities
+            if activity not in regulated_activities
+        ]
 
     def detect_missing_penalties(self, kb) -> List[Gap]:
         """Find prohibitions without associated penalties."""
         gaps = []
 
-        prohibitions = kb.query_extractions(category='prohibition') if hasattr(kb, 'query_extractions') else []
-        penalties = kb.query_extractions(category='penalty') if hasattr(kb, 'query_extractions') else []
+        prohibitions = query(kb, 'prohibition')
+        penalties = query(kb, 'penalty')
 
         prohibited_activities = set()
         for ext in prohibitions:
-            activity = ext.get('activity', ext.get('metadata', {}).get('activity', ''))
+            activity = ext.get('activity') or ext['metadata'].get('activity', '')
             if activity:
                 prohibited_activities.add(activity.lower())
 
         penalized_activities = set()
         for ext in penalties:
-            violation = ext.get('violation', ext.get('metadata', {}).get('violation', ''))
+            violation = ext.get('violation') or ext['metadata'].get('violation', '')
             if violation:
                 penalized_activities.add(violation.lower())
 
@@ -111,7 +116,7 @@ class LegalGapDetector:
         """Find legal requirements that lack specific numeric values."""
         gaps = []
 
-        distance_extractions = kb.query_extractions(category='distance') if hasattr(kb, 'query_extractions') else []
+        distance_extractions = query(kb, 'distance')
 
         low_confidence = [
             ext for ext in distance_extractions
@@ -135,11 +140,11 @@ class LegalGapDetector:
         """Detect potential enforcement gaps."""
         gaps = []
 
-        permits = kb.query_extractions(category='permit') if hasattr(kb, 'query_extractions') else []
+        permits = query(kb, 'permit')
 
         permits_without_authority = [
             ext for ext in permits
-            if not ext.get('issuing_authority', ext.get('metadata', {}).get('issuing_authority'))
+            if not (ext.get('issuing_authority') or ext['metadata'].get('issuing_authority'))
         ]
 
         if permits_without_authority:
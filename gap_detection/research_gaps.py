@@ -6,11 +6,14 @@ by analyzing extraction patterns across the corpus.
 """
 
 from typing import Dict, List
-from collections import Counter, defaultdict
+from collections import Counter
 
-import sys
-sys.path.insert(0, str(__import__('pathlib').Path(__file__).parent.parent))
-from data_structures.integrated import Gap
+try:
+    from ..data_structures.integrated import Gap
+except ImportError:
+    from data_structures.integrated import Gap
+
+from .common import query
 
 
 class ResearchGapDetector:
@@ -27,17 +30,15 @@ class ResearchGapDetector:
 
     def detect_method_gaps(self, kb) -> List[Gap]:
         """Find underutilized research methods."""
-        gaps = []
-        method_counts = Counter()
-
         # Count method usage across documents
-        extractions = kb.query_extractions(category='method') if hasattr(kb, 'query_extractions') else []
-        for ext in extractions:
-            method_type = ext.get('method_type', ext.get('metadata', {}).get('method_type', 'unknown'))
-            method_counts[method_type] += 1
+        extractions = query(kb, 'method')
+        method_counts = Counter(
+            ext.get('method_type') or ext['metadata'].get('method_type', 'unknown')
+            for ext in extractions
+        )
 
         if not method_counts:
-            return gaps
+            return []
 
         avg_usage = sum(method_counts.values()) / len(method_counts) if method_counts else 0
 
@@ -47,48 +48,47 @@ class ResearchGapDetector:
             'economic_analysis', 'cumulative_impact', 'scenario_planning'
         ]
 
-        for method in expected_methods:
-            count = method_counts.get(method, 0)
-            if count < avg_usage * 0.3:
-                severity = 'critical' if count == 0 else 'important'
-                gaps.append(Gap(
-                    gap_category='research',
-                    gap_type='method_gap',
-                    severity=severity,
-                    description=f"Method '{method}' is underutilized ({count} uses vs avg {avg_usage:.0f})",
-                    impact=f"MSP decisions may lack {method} evidence base",
-                    recommendation=f"Encourage use of {method} in future MSP studies",
-                    evidence=[f"Used in {count} papers, average method usage: {avg_usage:.0f}"],
-                ))
-
-        return gaps
+        return [
+            Gap(
+                gap_category='research',
+                gap_type='method_gap',
+                severity='critical' if method_counts[method] == 0 else 'important',
+                description=f"Method '{method}' is underutilized ({method_counts[method]} uses vs avg {avg_usage:.0f})",
+                impact=f"MSP decisions may lack {method} evidence base",
+                recommendation=f"Encourage use of {method} in future MSP studies",
+                evidence=[f"Used in {method_counts[method]} papers, average method usage: {avg_usage:.0f}"],
+            )
+            for method in expected_methods
+            if method_counts[method] < avg_usage * 0.3
+        ]
 
     def detect_geographic_gaps(self, kb) -> List[Gap]:
         """Find geographic areas with low research coverage."""
-        gaps = []
 
         # Analyze protected areas mentioned vs studied
-        pa_extractions = kb.query_extractions(category='protected_area') if hasattr(kb, 'query_extractions') else []
-        pa_by_doc = defaultdict(set)
+        pa_extractions = query(kb, 'protected_area')
+        # Distinct (name, document) pairs in first-seen order, then a
+        # group-by count per name
+        pa_docs = {}
         for ext in pa_extractions:
-            name = ext.get('name', ext.get('metadata', {}).get('name', ''))
-            doc = ext.get('source_file', ext.get('document_id', ''))
+            name = ext.get('name') or ext['metadata'].get('name', '')
             if name:
-                pa_by_doc[name].add(str(doc))
-
-        for pa_name, docs in pa_by_doc.items():
-            if len(docs) < 2:
-                gaps.append(Gap(
-                    gap_category='research',
-                    gap_type='geographic_gap',
-                    severity='important',
-                    description=f"Protected area '{pa_name}' mentioned in only {len(docs)} document(s)",
-                    impact=f"Insufficient research coverage for management of {pa_name}",
-                    recommendation=f"Prioritize research in {pa_name}",
-                    evidence=[f"Mentioned in {len(docs)} documents"],
-                ))
+                pa_docs[(name, str(ext.get('source_file', ext.get('document_id', ''))))] = None
+        pa_doc_counts = Counter(name for name, _ in pa_docs)
 
-        return gaps
+        return [
+            Gap(
+                gap_category='research',
+                gap_type='geographic_gap',
+                severity='important',
+                description=f"Protected area '{pa_name}' mentioned in only {count} document(s)",
+                impact=f"Insufficient research coverage for management of {pa_name}",
+                recommendation=f"Prioritize research in {pa_name}",
+                evidence=[f"Mentioned in {count} documents"],
+            )
+            for pa_name, count in pa_doc_counts.items()
+            if count < 2
+        ]
 
     def detect_thematic_gaps(self, kb) -> List[Gap]:
         """Find under-researched MSP themes."""
@@ -126,7 +126,7 @@ class ResearchGapDetector:
         """Find time periods with insufficient research coverage."""
         gaps = []
 
-        temporal_extractions = kb.query_extractions(category='temporal') if hasattr(kb, 'query_extractions') else []
+        temporal_extractions = query(kb, 'temporal')
 
         if not temporal_extractions:
             gaps.append(Gap(
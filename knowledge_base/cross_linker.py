@@ -1,11 +1,31 @@
 import json
 import logging
-from typing import Dict, List, Set, Tuple
+from collections import Counter
+from itertools import combinations, groupby, product
+from operator import itemgetter
+from typing import Dict, FrozenSet, List, Tuple
 
 from .database import KnowledgeDatabase
 
 logger = logging.getLogger(__name__)
 
+# (extraction1_id, extraction2_id, link_type, confidence)
+Link = Tuple[int, int, str, float]
+
+# Pending links are written to the database in batches of this size
+LINK_BATCH_SIZE = 10000
+
+# SQL version of CrossLinker._extract_entity_name() for the extraction
+# aliased ``e``; format {field} with one of KnowledgeDatabase.NAME_COLUMNS.
+# The metadata JSON is only decoded, by SQLite's json_extract(), for rows
+# without that name, and the name is trimmed of the whitespace str.strip()
+# removes.
+ENTITY_NAME_SQL = """TRIM(COALESCE(
+    NULLIF(e.{field}, ''),
+    CASE WHEN json_valid(e.metadata)
+         THEN NULLIF(json_extract(e.metadata, '$.name'), '') END,
+    e.exact_text, ''), ' ' || char(9, 10, 11, 12, 13, 160))"""
+
 
 class CrossLinker:
     """Creates cross-references between extractions from different
@@ -13,6 +33,10 @@ class CrossLinker:
 
     def __init__(self, db: KnowledgeDatabase):
         self.db = db
+        # Group names like Python does; str.lower()/strip() are not
+        # ASCII-only like SQLite's LOWER()/TRIM().
+        self.db.conn.create_function("name_key", 1, self._name_key,
+                                     deterministic=True)
 
     # ------------------------------------------------------------------
     # Public entry point
@@ -21,12 +45,18 @@ class CrossLinker:
     def link_all(self):
         """Run all cross-linking operations."""
         logger.info("Starting cross-linking process...")
-        self._link_species_across_sources()
-        self._link_methods_to_data()
-        self._link_legal_to_research()
-        self._link_conflicts_to_stakeholders()
-        self._link_conflicts_to_spatial()
-        self._build_integrated_knowledge()
+        steps = (
+            self._link_species_across_sources,
+            self._link_methods_to_data,
+            self._link_legal_to_research,
+            self._link_conflicts_to_stakeholders,
+            self._link_conflicts_to_spatial,
+            self._build_integrated_knowledge,
+        )
+        # One transaction per pass; batched flushes inside it join it
+        for step in steps:
+            with self.db.transaction():
+                step()
         logger.info("Cross-linking complete.")
 
     # ------------------------------------------------------------------
@@ -38,41 +68,46 @@ class CrossLinker:
         then create cross_references entries between them."""
         logger.info("Linking species across sources...")
 
-        rows = self.db.conn.execute("""
-            SELECT e.id, e.exact_text, e.metadata, d.doc_type
-            FROM extractions e
-            JOIN documents d ON e.document_id = d.id
-            WHERE e.category = 'species'
-        """).fetchall()
-
-        # Group extraction ids by normalised species name
-        species_groups: Dict[str, Dict[str, List[int]]] = {}
-        for row in rows:
-            name = self._extract_entity_name(row, field="species_name")
-            if not name:
-                continue
-            key = name.lower().strip()
-            doc_type = row["doc_type"] or "unknown"
-            species_groups.setdefault(key, {}).setdefault(doc_type, []).append(row["id"])
+        # Only species seen under at least two doc_types can be linked, so
+        # let SQLite drop the rest: a key whose MIN and MAX doc_type differ
+        # spans more than one doc_type. Rows arrive grouped by key.
+        rows = self.db.conn.execute(f"""
+            SELECT id, key, doc_type FROM (
+                SELECT id, key, doc_type,
+                       MIN(doc_type) OVER by_key AS first_type,
+                       MAX(doc_type) OVER by_key AS last_type
+                FROM (
+                    SELECT e.id,
+                           name_key({ENTITY_NAME_SQL.format(field="species_name")}) AS key,
+                           COALESCE(NULLIF(d.doc_type, ''), 'unknown') AS doc_type
+                    FROM extractions e
+                    JOIN documents d ON e.document_id = d.id
+                    WHERE e.category = 'species'
+                )
+                WHERE key != ''
+                WINDOW by_key AS (PARTITION BY key)
+            )
+            WHERE first_type != last_type
+            ORDER BY key, id
+        """)
 
         links_created = 0
-        for species, type_map in species_groups.items():
-            doc_types = list(type_map.keys())
-            # Only create links when the species appears in more than one doc_type
-            if len(doc_types) < 2:
-                continue
+        pending: List[Link] = []
+        for _, group in groupby(rows, key=itemgetter("key")):
+            if len(pending) >= LINK_BATCH_SIZE:
+                links_created += self._flush_links(pending)
+            # Extraction ids of this species per doc_type
+            type_map: Dict[str, List[int]] = {}
+            for row in group:
+                type_map.setdefault(row["doc_type"], []).append(row["id"])
             # Create pairwise links between different doc_types
-            for i in range(len(doc_types)):
-                for j in range(i + 1, len(doc_types)):
-                    for eid1 in type_map[doc_types[i]]:
-                        for eid2 in type_map[doc_types[j]]:
-                            self.db.insert_cross_reference(
-                                eid1, eid2,
-                                link_type="species_cross_source",
-                                confidence=1.0,
-                            )
-                            links_created += 1
+            for ids1, ids2 in combinations(type_map.values(), 2):
+                pending.extend(
+                    (eid1, eid2, "species_cross_source", 1.0)
+                    for eid1, eid2 in product(ids1, ids2)
+                )
 
+        links_created += self._flush_links(pending)
         logger.info("Species cross-linking created %d links.", links_created)
 
     # ------------------------------------------------------------------
@@ -87,62 +122,70 @@ class CrossLinker:
         """
         logger.info("Linking methods to data sources...")
 
-        methods = self.db.conn.execute("""
-            SELECT e.id, e.document_id, e.exact_text, e.metadata
-            FROM extractions e
-            WHERE e.category = 'methods'
-        """).fetchall()
-
+        # Dataset extractions by category or by document type. A UNION
+        # rather than OR lets each half use an index instead of scanning
+        # every extraction.
         datasets = self.db.conn.execute("""
-            SELECT e.id, e.document_id, e.exact_text, e.metadata, d.doc_type
+            SELECT e.id, e.document_id, e.exact_text
             FROM extractions e
-            JOIN documents d ON e.document_id = d.id
             WHERE e.category IN ('datasets', 'data_sources', 'data')
-               OR d.doc_type = 'dataset'
-        """).fetchall()
-
-        # Index datasets by document_id for co-occurrence linking
+            UNION
+            SELECT e.id, e.document_id, e.exact_text
+            FROM documents d
+            JOIN extractions e ON e.document_id = d.id
+            WHERE d.doc_type = 'dataset'
+            ORDER BY 1
+        """)
+
+        # One pass over the datasets builds both indexes:
+        # - by document_id for co-occurrence linking
+        # - an inverted index of meaningful words (longer than 4 characters,
+        #   shorter ones are too common) -> datasets that mention them
         ds_by_doc: Dict[int, List[int]] = {}
-        for ds in datasets:
-            ds_by_doc.setdefault(ds["document_id"], []).append(ds["id"])
+        ds_refs: List[Tuple[int, int]] = []
+        postings: Dict[str, List[int]] = {}
+        for idx, (ds_id, doc_id, text) in enumerate(datasets):
+            ds_by_doc.setdefault(doc_id, []).append(ds_id)
+            ds_refs.append((ds_id, doc_id))
+            for w in set((text or "").lower().split()):
+                if len(w) > 4:
+                    postings.setdefault(w, []).append(idx)
 
-        # Also build a keyword index for textual matching
-        ds_keywords: Dict[int, Set[str]] = {}
-        for ds in datasets:
-            text = (ds["exact_text"] or "").lower()
-            ds_keywords[ds["id"]] = set(text.split())
+        methods = self.db.conn.execute("""
+            SELECT e.id, e.document_id, e.exact_text
+            FROM extractions e
+            WHERE e.category = 'methods'
+        """)
 
         links_created = 0
+        pending: List[Link] = []
 
         for method in methods:
+            if len(pending) >= LINK_BATCH_SIZE:
+                links_created += self._flush_links(pending)
             # Same-document links
             for ds_id in ds_by_doc.get(method["document_id"], []):
-                self.db.insert_cross_reference(
-                    method["id"], ds_id,
-                    link_type="method_uses_data",
-                    confidence=0.9,
-                )
-                links_created += 1
+                pending.append((method["id"], ds_id, "method_uses_data", 0.9))
 
             # Keyword overlap links (lightweight heuristic)
             method_words = set((method["exact_text"] or "").lower().split())
             if len(method_words) < 2:
                 continue
-            for ds in datasets:
-                if ds["document_id"] == method["document_id"]:
-                    continue  # already linked above
-                overlap = method_words & ds_keywords.get(ds["id"], set())
-                # Require meaningful overlap (ignore very short common words)
-                meaningful = {w for w in overlap if len(w) > 4}
-                if len(meaningful) >= 2:
-                    confidence = min(1.0, 0.5 + 0.1 * len(meaningful))
-                    self.db.insert_cross_reference(
-                        method["id"], ds["id"],
-                        link_type="method_uses_data",
-                        confidence=round(confidence, 2),
-                    )
-                    links_created += 1
+            # Count shared meaningful words per dataset via the postings
+            shared = Counter()
+            for w in method_words:
+                shared.update(postings.get(w, ()))
+            for idx, n_shared in shared.items():
+                ds_id, doc_id = ds_refs[idx]
+                if n_shared < 2 or doc_id == method["document_id"]:
+                    continue  # same-document pairs are linked above
+                confidence = min(1.0, 0.5 + 0.1 * n_shared)
+                pending.append((
+                    method["id"], ds_id,
+                    "method_uses_data", round(confidence, 2),
+                ))
 
+        links_created += self._flush_links(pending)
         logger.info("Method-data linking created %d links.", links_created)
 
     # ------------------------------------------------------------------
@@ -157,50 +200,61 @@ class CrossLinker:
         """
         logger.info("Linking legal requirements to research...")
 
-        legal_rows = self.db.conn.execute("""
-            SELECT e.id, e.exact_text, e.context, e.category
-            FROM extractions e
-            JOIN documents d ON e.document_id = d.id
-            WHERE d.doc_type = 'legal'
-        """).fetchall()
+        # Build keyword sets
+        def _keywords(row) -> FrozenSet[str]:
+            text = f"{row['exact_text'] or ''} {row['context'] or ''}".lower()
+            return frozenset(w for w in text.split() if len(w) > 4)
 
         research_rows = self.db.conn.execute("""
-            SELECT e.id, e.exact_text, e.context, e.category
+            SELECT e.id, e.exact_text, e.context
             FROM extractions e
             JOIN documents d ON e.document_id = d.id
             WHERE d.doc_type = 'research'
-        """).fetchall()
-
-        if not legal_rows or not research_rows:
-            logger.info("No legal or research rows to link.")
+        """)
+
+        # Only words longer than 5 characters count towards the overlap, so
+        # the research side becomes an inverted index of those words ->
+        # positions in research_ids
+        research_ids: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        for idx, r in enumerate(research_rows):
+            research_ids.append(r["id"])
+            for w in _keywords(r):
+                if len(w) > 5:
+                    postings.setdefault(w, []).append(idx)
+        if not research_ids:
+            logger.info("No research rows to link.")
             return
 
-        # Build keyword sets
-        def _keywords(row) -> Set[str]:
-            text = f"{row['exact_text'] or ''} {row['context'] or ''}".lower()
-            return {w for w in text.split() if len(w) > 4}
-
-        research_kw: List[Tuple[int, Set[str]]] = [
-            (r["id"], _keywords(r)) for r in research_rows
-        ]
+        legal_rows = self.db.conn.execute("""
+            SELECT e.id, e.exact_text, e.context
+            FROM extractions e
+            JOIN documents d ON e.document_id = d.id
+            WHERE d.doc_type = 'legal'
+        """)
 
         links_created = 0
+        pending: List[Link] = []
         for legal in legal_rows:
+            if len(pending) >= LINK_BATCH_SIZE:
+                links_created += self._flush_links(pending)
             lkw = _keywords(legal)
             if len(lkw) < 2:
                 continue
-            for rid, rkw in research_kw:
-                overlap = lkw & rkw
-                meaningful = {w for w in overlap if len(w) > 5}
-                if len(meaningful) >= 3:
-                    confidence = min(1.0, 0.4 + 0.1 * len(meaningful))
-                    self.db.insert_cross_reference(
-                        legal["id"], rid,
-                        link_type="legal_research_support",
-                        confidence=round(confidence, 2),
-                    )
-                    links_created += 1
-
+            # Count shared meaningful words per research row via the
+            # postings; rows sharing none are never visited
+            shared = Counter()
+            for w in lkw:
+                if len(w) > 5:
+                    shared.update(postings.get(w, ()))
+            for idx in sorted(i for i, n in shared.items() if n >= 3):
+                confidence = min(1.0, 0.4 + 0.1 * shared[idx])
+                pending.append((
+                    legal["id"], research_ids[idx],
+                    "legal_research_support", round(confidence, 2),
+                ))
+
+        links_created += self._flush_links(pending)
         logger.info("Legal-research linking created %d links.", links_created)
 
     # ------------------------------------------------------------------
@@ -214,47 +268,45 @@ class CrossLinker:
         """
         logger.info("Linking conflicts to stakeholders...")
 
-        conflicts = self.db.conn.execute("""
-            SELECT e.id, e.document_id, e.exact_text, e.metadata
-            FROM extractions e
-            WHERE e.category = 'conflict'
-        """).fetchall()
+        # Same-document (conflict, stakeholder) pairs, grouped by conflict
+        pairs = self.db.conn.execute(f"""
+            SELECT c.id AS conflict_id, c.exact_text AS conflict_text,
+                   e.id, {ENTITY_NAME_SQL.format(field="stakeholder_name")} AS name
+            FROM extractions c
+            JOIN extractions e
+              ON e.document_id = c.document_id AND e.category = 'stakeholder'
+            WHERE c.category = 'conflict'
+            ORDER BY c.id
+        """)
 
-        stakeholders = self.db.conn.execute("""
-            SELECT e.id, e.document_id, e.exact_text, e.metadata
-            FROM extractions e
-            WHERE e.category = 'stakeholder'
-        """).fetchall()
-
-        if not conflicts or not stakeholders:
-            logger.info("No conflicts or stakeholders to link.")
-            return
-
-        # Index stakeholders by document_id
-        sh_by_doc: Dict[int, List] = {}
-        for sh in stakeholders:
-            sh_by_doc.setdefault(sh["document_id"], []).append(sh)
+        # Words of each stakeholder name, computed once per stakeholder
+        sh_words: Dict[int, FrozenSet[str]] = {}
 
         links_created = 0
-        for conflict in conflicts:
-            conflict_text = (conflict["exact_text"] or "").lower()
-            conflict_kw = {w for w in conflict_text.split() if len(w) > 3}
-
-            for sh in sh_by_doc.get(conflict["document_id"], []):
-                sh_name = self._extract_entity_name(sh, field="stakeholder_name").lower()
-                sh_words = {w for w in sh_name.split() if len(w) > 3}
+        pending: List[Link] = []
+        for conflict_id, group in groupby(pairs, key=itemgetter("conflict_id")):
+            if len(pending) >= LINK_BATCH_SIZE:
+                links_created += self._flush_links(pending)
+            conflict_kw = None
+            for sh in group:
+                if conflict_kw is None:
+                    conflict_text = (sh["conflict_text"] or "").lower()
+                    conflict_kw = {w for w in conflict_text.split() if len(w) > 3}
+                words = sh_words.get(sh["id"])
+                if words is None:
+                    sh_name = sh["name"].lower()
+                    words = sh_words[sh["id"]] = frozenset(w for w in sh_name.split() if len(w) > 3)
 
                 # Keyword overlap between conflict text and stakeholder name
-                overlap = conflict_kw & sh_words
+                overlap = not conflict_kw.isdisjoint(words)
                 confidence = 0.8 if overlap else 0.6  # same-doc baseline
 
-                self.db.insert_cross_reference(
-                    conflict["id"], sh["id"],
-                    link_type="conflict_involves_stakeholder",
-                    confidence=round(confidence, 2),
-                )
-                links_created += 1
+                pending.append((
+                    conflict_id, sh["id"],
+                    "conflict_involves_stakeholder", round(confidence, 2),
+                ))
 
+        links_created += self._flush_links(pending)
         logger.info("Conflict-stakeholder linking created %d links.", links_created)
 
     # ------------------------------------------------------------------
@@ -266,38 +318,24 @@ class CrossLinker:
         distances, coordinates) in the same document."""
         logger.info("Linking conflicts to spatial data...")
 
-        conflicts = self.db.conn.execute("""
-            SELECT e.id, e.document_id
-            FROM extractions e
-            WHERE e.category = 'conflict'
-        """).fetchall()
-
-        spatial = self.db.conn.execute("""
-            SELECT e.id, e.document_id, e.category
-            FROM extractions e
-            WHERE e.category IN ('protected_area', 'distance', 'coordinate')
-        """).fetchall()
-
-        if not conflicts or not spatial:
-            logger.info("No conflicts or spatial data to link.")
-            return
-
-        # Index spatial extractions by document_id
-        spatial_by_doc: Dict[int, List] = {}
-        for sp in spatial:
-            spatial_by_doc.setdefault(sp["document_id"], []).append(sp)
+        # Same-document (conflict, spatial extraction) pairs
+        pairs = self.db.conn.execute("""
+            SELECT c.id AS conflict_id, s.id AS spatial_id, s.category
+            FROM extractions c
+            JOIN extractions s
+              ON s.document_id = c.document_id
+             AND s.category IN ('protected_area', 'distance', 'coordinate')
+            WHERE c.category = 'conflict'
+        """)
 
         links_created = 0
-        for conflict in conflicts:
-            for sp in spatial_by_doc.get(conflict["document_id"], []):
-                link_type = f"conflict_in_{sp['category']}"
-                self.db.insert_cross_reference(
-                    conflict["id"], sp["id"],
-                    link_type=link_type,
-                    confidence=0.7,
-                )
-                links_created += 1
+        pending: List[Link] = []
+        for conflict_id, spatial_id, category in pairs:
+            if len(pending) >= LINK_BATCH_SIZE:
+                links_created += self._flush_links(pending)
+            pending.append((conflict_id, spatial_id, f"conflict_in_{category}", 0.7))
 
+        links_created += self._flush_links(pending)
         logger.info("Conflict-spatial linking created %d links.", links_created)
 
     # ------------------------------------------------------------------
@@ -319,54 +357,59 @@ class CrossLinker:
             ("mpas", "mpas", "mpa_name"),
         ]
 
-        total_entries = 0
+        entries = []
 
         for entity_type, category, name_field in entity_configs:
-            rows = self.db.conn.execute("""
-                SELECT e.exact_text, e.metadata, d.doc_type
-                FROM extractions e
-                JOIN documents d ON e.document_id = d.id
-                WHERE e.category = ?
-            """, (category,)).fetchall()
-
-            # Group by entity name
-            entity_stats: Dict[str, Dict[str, int]] = {}
-            for row in rows:
-                name = self._extract_entity_name(row, field=name_field)
-                if not name:
-                    continue
-                key = name.lower().strip()
-                stats = entity_stats.setdefault(key, {
-                    "display_name": name,
-                    "legal": 0,
-                    "research": 0,
-                    "dataset": 0,
-                })
-                doc_type = (row["doc_type"] or "unknown").lower()
-                if doc_type == "legal":
-                    stats["legal"] += 1
-                elif doc_type == "research":
-                    stats["research"] += 1
-                elif doc_type in ("dataset", "data"):
-                    stats["dataset"] += 1
-
-            for key, stats in entity_stats.items():
-                self.db.insert_integrated_knowledge(
-                    entity_type=entity_type,
-                    entity_name=stats["display_name"],
-                    legal_mentions=stats["legal"],
-                    research_mentions=stats["research"],
-                    data_sources=stats["dataset"],
-                    metadata={"normalised_key": key},
+            # Mentions per doc_type for each normalised name. The display
+            # name is taken from the first extraction with that name.
+            rows = self.db.conn.execute(f"""
+                SELECT name, name_key(name) AS key,
+                       MIN(id) AS first_id,
+                       SUM(doc_type = 'legal') AS legal,
+                       SUM(doc_type = 'research') AS research,
+                       SUM(doc_type IN ('dataset', 'data')) AS dataset
+                FROM (
+                    SELECT e.id,
+                           {ENTITY_NAME_SQL.format(field=name_field)} AS name,
+                           LOWER(COALESCE(d.doc_type, 'unknown')) AS doc_type
+                    FROM extractions e
+                    JOIN documents d ON e.document_id = d.id
+                    WHERE e.category = ?
                 )
-                total_entries += 1
+                WHERE name != ''
+                GROUP BY key
+                ORDER BY first_id
+            """, (category,))
+
+            entries.extend(
+                (entity_type, row["name"], row["legal"], row["research"],
+                 row["dataset"], {"normalised_key": row["key"]})
+                for row in rows
+            )
 
-        logger.info("Built %d integrated knowledge entries.", total_entries)
+        self.db.insert_integrated_knowledge_bulk(entries)
+        logger.info("Built %d integrated knowledge entries.", len(entries))
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    def _flush_links(self, pending: List[Link]) -> int:
+        """Write pending links in one transaction and clear the buffer.
+
+        Returns the number of links that were flushed.
+        """
+        count = len(pending)
+        if pending:
+            self.db.insert_cross_references_bulk(pending)
+            pending.clear()
+        return count
+
+    @staticmethod
+    def _name_key(name: str) -> str:
+        """Normalised form of an entity name used to group mentions."""
+        return name.lower().strip()
+
     @staticmethod
     def _extract_entity_name(row, field: str = "name") -> str:
         """Extract an entity name from either metadata JSON or exact_text."""
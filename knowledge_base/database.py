@@ -1,12 +1,40 @@
 import sqlite3
 import json
 import hashlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads_json(text):
+    """Decode JSON text with orjson when installed, else the json module.
+
+    orjson rejects a few things json accepts (NaN/Infinity, lone
+    surrogates), so those inputs are retried with json.loads.  Decode
+    errors from either library are json.JSONDecodeError.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 
 class KnowledgeDatabase:
+    # Stored in PRAGMA user_version; bumped when existing data must be migrated
+    SCHEMA_VERSION = 3
+
+    # Entity names copied out of the metadata JSON into their own columns
+    NAME_COLUMNS = ("species_name", "method_name", "mpa_name", "stakeholder_name")
+
     SCHEMA = '''
     CREATE TABLE IF NOT EXISTS documents (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,7 +56,11 @@ class KnowledgeDatabase:
         confidence REAL,
         marine_relevance REAL,
         metadata TEXT,  -- JSON blob for category-specific fields
-        extraction_hash TEXT,
+        extraction_hash BLOB,  -- 16-byte BLAKE2b digest, see _compute_hash
+        species_name TEXT,  -- NAME_COLUMNS, also kept in metadata
+        method_name TEXT,
+        mpa_name TEXT,
+        stakeholder_name TEXT,
         FOREIGN KEY (document_id) REFERENCES documents(id)
     );
 
@@ -54,25 +86,194 @@ class KnowledgeDatabase:
 
     CREATE INDEX IF NOT EXISTS idx_ext_category ON extractions(category);
     CREATE INDEX IF NOT EXISTS idx_ext_confidence ON extractions(confidence);
-    CREATE INDEX IF NOT EXISTS idx_ext_hash ON extractions(extraction_hash);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_ext_hash_doc
+        ON extractions(extraction_hash, document_id);
+    CREATE INDEX IF NOT EXISTS idx_ext_cat_doc ON extractions(category, document_id);
+    CREATE INDEX IF NOT EXISTS idx_ext_doc_cat ON extractions(document_id, category);
+    -- Serves "WHERE category = ? ORDER BY confidence DESC, id" without a sort
+    CREATE INDEX IF NOT EXISTS idx_ext_cat_conf ON extractions(category, confidence DESC);
     CREATE INDEX IF NOT EXISTS idx_doc_type ON documents(doc_type);
     CREATE INDEX IF NOT EXISTS idx_ik_type ON integrated_knowledge(entity_type);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_xref_unique
+        ON cross_references(extraction1_id, extraction2_id, link_type);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_ik_unique
+        ON integrated_knowledge(entity_type, entity_name);
     '''
 
+    # Trigram full-text index over the searchable extraction text.
+    # Trigrams match arbitrary substrings of 3+ characters, which is what
+    # the LIKE '%text%' searches it replaces do. The index is brought up to
+    # date by sync_fts() before searching rather than by insert triggers,
+    # which would make every ingest several times slower.
+    FTS_SCHEMA = """CREATE VIRTUAL TABLE IF NOT EXISTS extractions_fts USING fts5(
+        exact_text, context, metadata,
+        content='extractions', content_rowid='id', tokenize='trigram'
+    )"""
+
+    # Connection settings for the insert-heavy build: 8 KiB pages (only
+    # takes effect on a new database, so it must come before WAL is
+    # enabled), write-ahead logging with NORMAL sync (one fsync per
+    # checkpoint rather than two per commit), a 64 MiB page cache and
+    # 256 MiB of memory-mapped reads. WAL relies on shared memory, so the
+    # database file must live on a local filesystem, not a network share.
+    PRAGMAS = (
+        "PRAGMA page_size=8192",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
+
     def __init__(self, db_path="msp_knowledge.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        # Autocommit mode: single statements commit on their own and
+        # multi-statement writes use transaction() explicitly
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self._savepoints = 0
         self.conn.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            self.conn.execute(pragma)
         self._create_tables()
 
     def _create_tables(self):
         self.conn.executescript(self.SCHEMA)
-        self.conn.commit()
+        # Only an outdated database needs the write lock; opening a current
+        # one must not wait on (or fail against) another connection's writes
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            with self.transaction():
+                self._migrate()
+        # A no-op without locking once the index exists
+        self.has_fts = self._create_fts()
+
+    def _create_fts(self) -> bool:
+        """Create the full-text index if this SQLite build supports it.
+
+        Returns whether the index is available; without it searches fall
+        back to LIKE scans.
+        """
+        try:
+            self.conn.execute(self.FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            # No FTS5 module or trigram tokenizer (SQLite < 3.34)
+            return False
+        return True
+
+    def sync_fts(self):
+        """Add extractions inserted since the last sync to the full-text index.
+
+        Extractions are only ever appended, never edited, so indexing the
+        rows past the highest indexed id keeps the index complete. Called
+        by writers once they finish loading; searches never write.
+        """
+        if not self.has_fts:
+            return
+        with self.transaction():
+            last_id = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM extractions_fts_docsize"
+            ).fetchone()[0]
+            self.conn.execute(
+                """INSERT INTO extractions_fts(rowid, exact_text, context, metadata)
+                   SELECT id, exact_text, context, metadata
+                   FROM extractions WHERE id > ?""",
+                (last_id,)
+            )
+
+    def fts_is_current(self) -> bool:
+        """Whether every extraction has been added to the full-text index."""
+        return bool(self.conn.execute(
+            "SELECT (SELECT COALESCE(MAX(id), 0) FROM extractions)"
+            " <= (SELECT COALESCE(MAX(id), 0) FROM extractions_fts_docsize)"
+        ).fetchone()[0])
 
-    def _compute_hash(self, category: str, exact_text: str, context: str) -> str:
-        """Compute a hash for deduplication of extractions."""
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements in one write transaction.
+
+        Commits on success and rolls back if the block raises. Nested
+        uses join the transaction that is already open.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    @contextmanager
+    def savepoint(self):
+        """Run the enclosed statements so that they can fail on their own.
+
+        Inside a transaction(), a block that raises is rolled back to the
+        savepoint without undoing the rest of the transaction; the
+        exception still propagates. Outside one it behaves like
+        transaction().
+        """
+        if not self.conn.in_transaction:
+            with self.transaction():
+                yield
+            return
+        self._savepoints += 1
+        name = f"sp_{self._savepoints}"
+        self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute(f"ROLLBACK TO {name}")
+            self.conn.execute(f"RELEASE {name}")
+            raise
+        finally:
+            self._savepoints -= 1
+        self.conn.execute(f"RELEASE {name}")
+
+    def _migrate(self):
+        """Bring a database written by an older version up to SCHEMA_VERSION."""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            # Version 1 replaced hex SHA-256 extraction hashes with BLAKE2b
+            # digests; rehash so deduplication still matches old rows
+            self.conn.create_function("extraction_hash", 3, self._compute_hash,
+                                      deterministic=True)
+            self.conn.execute(
+                "UPDATE extractions SET extraction_hash = "
+                "extraction_hash(category, exact_text, context)"
+            )
+        if version < 2:
+            # Version 2 promoted NAME_COLUMNS out of the metadata JSON
+            columns = {row["name"] for row in
+                       self.conn.execute("PRAGMA table_info(extractions)")}
+            for column in self.NAME_COLUMNS:
+                if column not in columns:
+                    self.conn.execute(
+                        f"ALTER TABLE extractions ADD COLUMN {column} TEXT")
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_ext_{column} "
+                    f"ON extractions({column}) WHERE {column} IS NOT NULL"
+                )
+            assignments = ", ".join(f"{column} = json_extract(metadata, '$.{column}')"
+                                    for column in self.NAME_COLUMNS)
+            self.conn.execute(
+                f"UPDATE extractions SET {assignments} WHERE json_valid(metadata)")
+        if version < 3:
+            # Version 3 dropped the plain hash index, superseded by the
+            # unique idx_ext_hash_doc; every insert was still updating it
+            self.conn.execute("DROP INDEX IF EXISTS idx_ext_hash")
+        self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @staticmethod
+    def _compute_hash(category: str, exact_text: str, context: str) -> bytes:
+        """Compute a hash for deduplication of extractions.
+
+        A 128-bit BLAKE2b digest is plenty for deduplication and keeps the
+        hash index at a quarter of the size of hex SHA-256 strings.
+        """
         raw = f"{category}|{exact_text or ''}|{context or ''}"
-        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
 
     def insert_document(self, filename: str, doc_type: str, language: str,
                         pages: int, source_path: Optional[str] = None) -> int:
@@ -89,7 +290,6 @@ class KnowledgeDatabase:
                 (filename, doc_type, language, pages,
                  datetime.now().isoformat(), source_path)
             )
-            self.conn.commit()
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             # Document already exists – return existing id
@@ -98,6 +298,48 @@ class KnowledgeDatabase:
             ).fetchone()
             return row["id"]
 
+    # Columns filled from an extraction dict; everything else is metadata
+    STANDARD_KEYS = frozenset({
+        "exact_text", "context", "page_number",
+        "confidence", "marine_relevance"
+    })
+
+    # Hashes per "IN (...)" lookup, well under SQLite's bound-variable limit
+    HASH_LOOKUP_CHUNK = 500
+
+    _INSERT_EXTRACTION = """INSERT OR IGNORE INTO extractions
+               (document_id, category, exact_text, context, page_number,
+                confidence, marine_relevance, metadata, species_name,
+                method_name, mpa_name, stakeholder_name, extraction_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    def _extraction_row(self, document_id: int, category: str,
+                        extraction_data: Dict) -> Tuple:
+        """Build the extractions row for one extraction dict.
+
+        The extraction hash is always the last value of the row.
+        """
+        exact_text = extraction_data.get("exact_text", "")
+        context = extraction_data.get("context", "")
+        extra = {k: v for k, v in extraction_data.items()
+                 if k not in self.STANDARD_KEYS}
+        metadata_json = json.dumps(extra, ensure_ascii=False) if extra else None
+        return (document_id, category, exact_text, context,
+                extraction_data.get("page_number"),
+                extraction_data.get("confidence", 0.0),
+                extraction_data.get("marine_relevance"),
+                metadata_json,
+                *(self._name_value(extraction_data.get(column))
+                  for column in self.NAME_COLUMNS),
+                self._compute_hash(category, exact_text, context))
+
+    @staticmethod
+    def _name_value(value):
+        """Value of a NAME_COLUMNS column, as json_extract() would give it."""
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
     def insert_extraction(self, document_id: int, category: str,
                           extraction_data: Dict) -> int:
         """Insert a single extraction and return its id.
@@ -105,50 +347,69 @@ class KnowledgeDatabase:
         ``extraction_data`` is a dict that may contain the keys:
         exact_text, context, page_number, confidence, marine_relevance,
         and any additional category-specific fields stored as JSON metadata.
+        Duplicates (same hash within a document) return the existing id.
         """
-        exact_text = extraction_data.get("exact_text", "")
-        context = extraction_data.get("context", "")
-        page_number = extraction_data.get("page_number")
-        confidence = extraction_data.get("confidence", 0.0)
-        marine_relevance = extraction_data.get("marine_relevance")
-        extraction_hash = self._compute_hash(category, exact_text, context)
-
-        # Everything that is not a standard column goes into metadata
-        standard_keys = {
-            "exact_text", "context", "page_number",
-            "confidence", "marine_relevance"
-        }
-        extra = {k: v for k, v in extraction_data.items()
-                 if k not in standard_keys}
-        metadata_json = json.dumps(extra, ensure_ascii=False) if extra else None
-
-        # Skip duplicates based on hash
+        row = self._extraction_row(document_id, category, extraction_data)
+        with self.transaction():
+            cursor = self.conn.execute(self._INSERT_EXTRACTION, row)
+        if cursor.rowcount:
+            return cursor.lastrowid
         existing = self.conn.execute(
             "SELECT id FROM extractions WHERE extraction_hash = ? AND document_id = ?",
-            (extraction_hash, document_id)
+            (row[-1], document_id)
         ).fetchone()
-        if existing:
-            return existing["id"]
-
-        cursor = self.conn.execute(
-            """INSERT INTO extractions
-               (document_id, category, exact_text, context, page_number,
-                confidence, marine_relevance, metadata, extraction_hash)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (document_id, category, exact_text, context, page_number,
-             confidence, marine_relevance, metadata_json, extraction_hash)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        return existing["id"]
 
     def insert_batch_extractions(self, document_id: int, category: str,
                                  extractions_list: List[Dict]) -> List[int]:
-        """Insert multiple extractions for a category. Returns list of ids."""
-        ids = []
-        for ext in extractions_list:
-            ext_id = self.insert_extraction(document_id, category, ext)
-            ids.append(ext_id)
-        return ids
+        """Insert multiple extractions for a category. Returns list of ids.
+
+        All rows go in with one executemany in a single transaction; the ids,
+        including those of duplicates, are then looked up by hash.
+        """
+        rows = [self._extraction_row(document_id, category, ext)
+                for ext in extractions_list]
+        return self._insert_extraction_rows(document_id, rows)
+
+    def insert_batch_extractions_multi(self, document_id: int,
+                                       items_by_category: Dict[str, List[Dict]]
+                                       ) -> Dict[str, List[int]]:
+        """Insert extractions of several categories for one document.
+
+        Like :meth:`insert_batch_extractions`, but every category goes in
+        with the same executemany.  Returns the ids per category.
+        """
+        rows = [self._extraction_row(document_id, category, ext)
+                for category, items in items_by_category.items()
+                for ext in items]
+        ids = iter(self._insert_extraction_rows(document_id, rows))
+        return {category: [next(ids) for _ in items]
+                for category, items in items_by_category.items()}
+
+    def _insert_extraction_rows(self, document_id: int,
+                                rows: List[Tuple]) -> List[int]:
+        """Insert rows built by _extraction_row and return their ids."""
+        if not rows:
+            return []
+        # Drop repeats within the batch up front; an ignored insert still
+        # burns an AUTOINCREMENT id
+        unique_rows = {}
+        for row in rows:
+            unique_rows.setdefault(row[-1], row)
+        with self.transaction():
+            self.conn.executemany(self._INSERT_EXTRACTION, unique_rows.values())
+
+        hashes = list(unique_rows)
+        id_by_hash = {}
+        for start in range(0, len(hashes), self.HASH_LOOKUP_CHUNK):
+            chunk = hashes[start:start + self.HASH_LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            id_by_hash.update(self.conn.execute(
+                f"SELECT extraction_hash, id FROM extractions "
+                f"WHERE document_id = ? AND extraction_hash IN ({placeholders})",
+                (document_id, *chunk)
+            ).fetchall())
+        return [id_by_hash[row[-1]] for row in rows]
 
     def query_extractions(self, category: Optional[str] = None,
                           min_confidence: float = 0.0,
@@ -177,26 +438,35 @@ class KnowledgeDatabase:
             query += " AND d.doc_type = ?"
             params.append(doc_type)
 
-        query += " ORDER BY e.confidence DESC LIMIT ?"
+        query += " ORDER BY e.confidence DESC, e.id LIMIT ?"
         params.append(limit)
 
-        rows = self.conn.execute(query, params).fetchall()
-        results = []
-        for row in rows:
-            d = dict(row)
+        return list(self.extraction_dicts(self.conn.execute(query, params)))
+
+    @staticmethod
+    def extraction_dicts(cursor) -> Iterator[Dict]:
+        """Yield the rows of an extraction query as plain dicts.
+
+        Keys are the selected column names; ``metadata`` is decoded from
+        JSON when it parses and left as stored otherwise.
+        """
+        # zip() with the column names builds each dict about twice as fast
+        # as dict(sqlite3.Row)
+        columns = [col[0] for col in cursor.description]
+        for row in cursor:
+            d = dict(zip(columns, row))
             if d.get("metadata"):
                 try:
-                    d["metadata"] = json.loads(d["metadata"])
+                    d["metadata"] = loads_json(d["metadata"])
                 except (json.JSONDecodeError, TypeError):
                     pass
-            results.append(d)
-        return results
+            yield d
 
     def get_document_summary(self) -> Dict:
         """Get summary statistics across all documents."""
-        total_docs = self.conn.execute(
-            "SELECT COUNT(*) AS cnt FROM documents"
-        ).fetchone()["cnt"]
+        totals = self.conn.execute(
+            "SELECT COUNT(*) AS cnt, COALESCE(SUM(pages), 0) AS pages FROM documents"
+        ).fetchone()
 
         by_type = self.conn.execute(
             "SELECT doc_type, COUNT(*) AS cnt FROM documents GROUP BY doc_type"
@@ -206,13 +476,9 @@ class KnowledgeDatabase:
             "SELECT language, COUNT(*) AS cnt FROM documents GROUP BY language"
         ).fetchall()
 
-        total_pages = self.conn.execute(
-            "SELECT COALESCE(SUM(pages), 0) AS total FROM documents"
-        ).fetchone()["total"]
-
         return {
-            "total_documents": total_docs,
-            "total_pages": total_pages,
+            "total_documents": totals["cnt"],
+            "total_pages": totals["pages"],
             "by_type": {row["doc_type"]: row["cnt"] for row in by_type},
             "by_language": {row["language"]: row["cnt"] for row in by_language},
         }
@@ -227,25 +493,44 @@ class KnowledgeDatabase:
     def insert_cross_reference(self, extraction1_id: int, extraction2_id: int,
                                link_type: str, confidence: float = 1.0) -> int:
         """Insert a cross-reference between two extractions."""
-        # Avoid duplicate links (order-independent)
+        # Avoid duplicate links (order-independent); the unique index on
+        # the pair and link type makes an existing link a no-op
         lo, hi = sorted([extraction1_id, extraction2_id])
-        existing = self.conn.execute(
-            """SELECT id FROM cross_references
-               WHERE extraction1_id = ? AND extraction2_id = ?
-                     AND link_type = ?""",
-            (lo, hi, link_type)
-        ).fetchone()
-        if existing:
-            return existing["id"]
-
         cursor = self.conn.execute(
-            """INSERT INTO cross_references
+            """INSERT OR IGNORE INTO cross_references
                (extraction1_id, extraction2_id, link_type, confidence)
                VALUES (?, ?, ?, ?)""",
             (lo, hi, link_type, confidence)
         )
-        self.conn.commit()
-        return cursor.lastrowid
+        if cursor.rowcount:
+            return cursor.lastrowid
+
+        return self.conn.execute(
+            """SELECT id FROM cross_references
+               WHERE extraction1_id = ? AND extraction2_id = ?
+                     AND link_type = ?""",
+            (lo, hi, link_type)
+        ).fetchone()["id"]
+
+    def insert_cross_references_bulk(
+            self, links: Iterable[Tuple[int, int, str, float]]) -> int:
+        """Insert many cross-references in a single transaction.
+
+        ``links`` holds ``(extraction1_id, extraction2_id, link_type,
+        confidence)`` tuples. Pairs are stored order-independently like
+        insert_cross_reference(), and links that already exist are skipped.
+        Returns the number of rows inserted.
+        """
+        rows = ((min(e1, e2), max(e1, e2), link_type, confidence)
+                for e1, e2, link_type, confidence in links)
+        with self.transaction():
+            cursor = self.conn.executemany(
+                """INSERT OR IGNORE INTO cross_references
+                   (extraction1_id, extraction2_id, link_type, confidence)
+                   VALUES (?, ?, ?, ?)""",
+                rows
+            )
+        return cursor.rowcount
 
     def insert_integrated_knowledge(self, entity_type: str, entity_name: str,
                                     legal_mentions: int = 0,
@@ -253,39 +538,71 @@ class KnowledgeDatabase:
                                     data_sources: int = 0,
                                     metadata: Optional[Dict] = None) -> int:
         """Insert or update an integrated knowledge entry."""
-        existing = self.conn.execute(
-            """SELECT id FROM integrated_knowledge
-               WHERE entity_type = ? AND entity_name = ?""",
-            (entity_type, entity_name)
-        ).fetchone()
+        with self.transaction():
+            existing = self.conn.execute(
+                """SELECT id FROM integrated_knowledge
+                   WHERE entity_type = ? AND entity_name = ?""",
+                (entity_type, entity_name)
+            ).fetchone()
 
-        metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
+            metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata else None
 
-        if existing:
-            self.conn.execute(
-                """UPDATE integrated_knowledge
-                   SET legal_mentions = ?, research_mentions = ?,
-                       data_sources = ?, metadata = ?
-                   WHERE id = ?""",
-                (legal_mentions, research_mentions, data_sources,
-                 metadata_json, existing["id"])
+            if existing:
+                self.conn.execute(
+                    """UPDATE integrated_knowledge
+                       SET legal_mentions = ?, research_mentions = ?,
+                           data_sources = ?, metadata = ?
+                       WHERE id = ?""",
+                    (legal_mentions, research_mentions, data_sources,
+                     metadata_json, existing["id"])
+                )
+                return existing["id"]
+
+            cursor = self.conn.execute(
+                """INSERT INTO integrated_knowledge
+                   (entity_type, entity_name, legal_mentions,
+                    research_mentions, data_sources, metadata)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (entity_type, entity_name, legal_mentions,
+                 research_mentions, data_sources, metadata_json)
             )
-            self.conn.commit()
-            return existing["id"]
+            return cursor.lastrowid
 
-        cursor = self.conn.execute(
-            """INSERT INTO integrated_knowledge
-               (entity_type, entity_name, legal_mentions,
-                research_mentions, data_sources, metadata)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (entity_type, entity_name, legal_mentions,
-             research_mentions, data_sources, metadata_json)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+    def insert_integrated_knowledge_bulk(
+            self, entries: Iterable[Tuple[str, str, int, int, int, Optional[Dict]]]) -> int:
+        """Insert or update many integrated knowledge entries at once.
+
+        ``entries`` holds ``(entity_type, entity_name, legal_mentions,
+        research_mentions, data_sources, metadata)`` tuples. Existing entries
+        with the same type and name are overwritten, as in
+        insert_integrated_knowledge(). Returns the number of rows written.
+        """
+        rows = ((entity_type, entity_name, legal, research, data,
+                 json.dumps(metadata, ensure_ascii=False) if metadata else None)
+                for entity_type, entity_name, legal, research, data, metadata in entries)
+        with self.transaction():
+            cursor = self.conn.executemany(
+                """INSERT INTO integrated_knowledge
+                   (entity_type, entity_name, legal_mentions,
+                    research_mentions, data_sources, metadata)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(entity_type, entity_name) DO UPDATE SET
+                       legal_mentions = excluded.legal_mentions,
+                       research_mentions = excluded.research_mentions,
+                       data_sources = excluded.data_sources,
+                       metadata = excluded.metadata""",
+                rows
+            )
+        return cursor.rowcount
+
+    def analyze(self):
+        """Refresh the query planner's statistics; run after bulk loads."""
+        self.conn.execute("ANALYZE")
 
     def close(self):
         """Close the database connection."""
         if self.conn:
+            # Let SQLite refresh planner statistics the session found stale
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
             self.conn = None
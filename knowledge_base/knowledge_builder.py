@@ -1,12 +1,34 @@
-import json
 import logging
+import os
+from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
-from .database import KnowledgeDatabase
+from .database import KnowledgeDatabase, loads_json
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# ijson events that carry a scalar value
+_SCALAR_EVENTS = frozenset({"null", "boolean", "integer", "double", "number", "string"})
+
+
+def _parse(fh):
+    """ijson events with non-integer numbers as floats, like json.load.
+
+    ijson's own use_float option is not used because the C backend then
+    rejects integers beyond 64 bits.
+    """
+    for prefix, event, value in ijson.parse(fh):
+        if event == "number" and isinstance(value, Decimal):
+            value = float(value)
+        yield prefix, event, value
+
 
 class KnowledgeBuilder:
     """Ingests JSON result files produced by the extraction pipeline
@@ -20,6 +42,13 @@ class KnowledgeBuilder:
         "data": "dataset",
     }
 
+    # Result files at least this large are streamed with ijson, when it is
+    # installed, instead of being loaded whole; below it loading whole is faster
+    STREAM_MIN_BYTES = 1 << 20
+
+    # Streamed extractions are inserted in batches of this size
+    STREAM_BATCH_SIZE = 500
+
     def __init__(self, db: KnowledgeDatabase):
         self.db = db
 
@@ -39,41 +68,45 @@ class KnowledgeBuilder:
             logger.warning("Results directory does not exist: %s", results_dir)
             return 0
 
-        json_files = sorted(results_path.glob("*_results.json"))
-        if not json_files:
-            # Also try plain *.json as a fallback
-            json_files = sorted(results_path.glob("*.json"))
+        # One directory pass; plain *.json files are the fallback when no
+        # *_results.json file is present
+        results_files, other_files = [], []
+        with os.scandir(results_path) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                if entry.name.endswith("_results.json"):
+                    results_files.append(Path(entry.path))
+                else:
+                    other_files.append(Path(entry.path))
+        json_files = sorted(results_files) or sorted(other_files)
 
+        # One transaction for the whole directory; a file that fails is
+        # rolled back to its savepoint without losing the others
         ingested = 0
-        for jf in json_files:
-            try:
-                self.ingest_single_result(str(jf), doc_type_hint=doc_type_hint)
-                ingested += 1
-            except Exception as exc:
-                logger.error("Failed to ingest %s: %s", jf.name, exc)
+        with self.db.transaction():
+            for jf in json_files:
+                try:
+                    with self.db.savepoint():
+                        self.ingest_single_result(str(jf), doc_type_hint=doc_type_hint)
+                    ingested += 1
+                except Exception as exc:
+                    logger.error("Failed to ingest %s: %s", jf.name, exc)
         return ingested
 
     def ingest_single_result(self, json_path: str,
                              doc_type_hint: Optional[str] = None) -> int:
         """Load a single JSON result file and return the document id."""
         path = Path(json_path)
-        with open(path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        if IJSON_AVAILABLE and path.stat().st_size >= self.STREAM_MIN_BYTES:
+            header = self._scan_header(path)
+            if header is not None:
+                return self._ingest_streaming(path, header, doc_type_hint)
 
-        # --- Determine document metadata ---
-        filename = data.get("filename", path.stem)
-        doc_type = data.get("doc_type") or doc_type_hint or self._guess_doc_type(path)
-        language = data.get("language", "unknown")
-        pages = data.get("pages", data.get("total_pages", 0))
-        source_path = data.get("source_path", str(path))
+        with open(path, "r", encoding="utf-8") as fh:
+            data = loads_json(fh.read())
 
-        doc_id = self.db.insert_document(
-            filename=filename,
-            doc_type=doc_type,
-            language=language,
-            pages=pages,
-            source_path=source_path,
-        )
+        doc_id, filename, doc_type = self._insert_document(path, data, doc_type_hint)
 
         # --- Ingest extractions -----------------------------------------
         # The results JSON is expected to have a top-level key "extractions"
@@ -95,9 +128,12 @@ class KnowledgeBuilder:
                     # Single extraction dict rather than a list
                     self.db.insert_extraction(doc_id, category, items)
         elif isinstance(extractions, list):
+            # Group by category so the whole list goes in as a single batch
+            by_category: Dict[str, list] = {}
             for item in extractions:
                 category = item.get("category", "uncategorised")
-                self.db.insert_extraction(doc_id, category, item)
+                by_category.setdefault(category, []).append(item)
+            self.db.insert_batch_extractions_multi(doc_id, by_category)
 
         # Some result files store categories at the top level (e.g.
         # "species", "methods", "distances" keys directly).  We handle
@@ -116,6 +152,35 @@ class KnowledgeBuilder:
                     if isinstance(value[0], dict):
                         self.db.insert_batch_extractions(doc_id, key, value)
 
+        self.db.sync_fts()
+        logger.info("Ingested %s (doc_id=%d, type=%s)", filename, doc_id, doc_type)
+        return doc_id
+
+    def _ingest_streaming(self, path: Path, header: Dict,
+                          doc_type_hint: Optional[str]) -> int:
+        """Ingest a result file whose "extractions" object is streamed.
+
+        Only one batch of extractions is held in memory at a time.
+        """
+        doc_id, filename, doc_type = self._insert_document(path, header, doc_type_hint)
+
+        batch_category, batch = None, []
+        with open(path, "rb") as fh:
+            for category, item, in_list in self._iter_extractions(fh):
+                if batch and (category != batch_category
+                              or len(batch) >= self.STREAM_BATCH_SIZE):
+                    self.db.insert_batch_extractions(doc_id, batch_category, batch)
+                    batch = []
+                if in_list:
+                    batch_category = category
+                    batch.append(item)
+                else:
+                    # Single extraction dict rather than a list
+                    self.db.insert_extraction(doc_id, category, item)
+        if batch:
+            self.db.insert_batch_extractions(doc_id, batch_category, batch)
+
+        self.db.sync_fts()
         logger.info("Ingested %s (doc_id=%d, type=%s)", filename, doc_id, doc_type)
         return doc_id
 
@@ -154,6 +219,83 @@ class KnowledgeBuilder:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _insert_document(self, path: Path, data: Dict,
+                         doc_type_hint: Optional[str]) -> Tuple[int, str, str]:
+        """Insert the document described by a result file.
+
+        Returns ``(doc_id, filename, doc_type)``.
+        """
+        filename = data.get("filename", path.stem)
+        doc_type = data.get("doc_type") or doc_type_hint or self._guess_doc_type(path)
+        language = data.get("language", "unknown")
+        pages = data.get("pages", data.get("total_pages", 0))
+        source_path = data.get("source_path", str(path))
+
+        doc_id = self.db.insert_document(
+            filename=filename,
+            doc_type=doc_type,
+            language=language,
+            pages=pages,
+            source_path=source_path,
+        )
+        return doc_id, filename, doc_type
+
+    @staticmethod
+    def _scan_header(path: Path) -> Optional[Dict]:
+        """Collect the top-level scalar fields of a result file.
+
+        Returns None unless the file has a non-empty "extractions" object,
+        the only layout that is streamed; other layouts are loaded whole.
+        """
+        header: Dict = {}
+        streamable = False
+        with open(path, "rb") as fh:
+            for prefix, event, value in _parse(fh):
+                if event in _SCALAR_EVENTS and prefix and "." not in prefix:
+                    header[prefix] = value
+                elif prefix == "extractions" and event == "map_key":
+                    streamable = True
+        return header if streamable else None
+
+    @staticmethod
+    def _iter_extractions(fh) -> Iterator[Tuple[str, object, bool]]:
+        """Yield ``(category, extraction, in_list)`` from "extractions".
+
+        Categories holding a list yield each item with ``in_list`` True; a
+        category holding a single dict yields it with ``in_list`` False.
+        """
+        category = builder = None
+        depth = 0
+        for prefix, event, value in _parse(fh):
+            if builder is not None:
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                if depth == 0:
+                    yield category, builder.value, in_list
+                    builder = None
+                continue
+
+            if prefix == "extractions" and event == "map_key":
+                category = value
+            elif category is None:
+                continue
+            elif prefix == f"extractions.{category}.item":
+                in_list = True
+            elif prefix == f"extractions.{category}" and event == "start_map":
+                in_list = False
+            else:
+                continue
+
+            if event in _SCALAR_EVENTS:
+                yield category, value, in_list
+            elif event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+
     def _guess_doc_type(self, path: Path) -> str:
         """Try to infer the doc_type from the file path."""
         parts = [p.lower() for p in path.parts]
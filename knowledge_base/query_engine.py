@@ -1,14 +1,24 @@
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from .database import KnowledgeDatabase
+from .database import KnowledgeDatabase, loads_json
+
+
+def _py_lower(value):
+    """str.lower() for SQL, passing NULL and non-text values through."""
+    return value.lower() if isinstance(value, str) else value
 
 
 class QueryEngine:
     """High-level query interface over the knowledge database."""
 
+    # Categories reported by get_legal_requirements_for_activity, in order
+    LEGAL_CATEGORIES = ("distances", "penalties", "prohibitions", "permits",
+                        "requirements", "regulations")
+
     def __init__(self, db: KnowledgeDatabase):
         self.db = db
+        # Case-fold like str.lower(); SQLite's LOWER() and NOCASE are ASCII-only
+        self.db.conn.create_function("py_lower", 1, _py_lower, deterministic=True)
 
     # ------------------------------------------------------------------
     # Full-text search
@@ -19,39 +29,27 @@ class QueryEngine:
                            limit: int = 100) -> List[Dict]:
         """Full-text search in exact_text and context fields.
 
-        Uses SQLite LIKE for portability.  The *keyword* is matched
-        case-insensitively anywhere in the text.
+        The *keyword* is matched case-insensitively anywhere in the text,
+        see :meth:`_text_filter`.
         """
-        like_pattern = f"%{keyword}%"
-        query = """
+        text_filter, params = self._text_filter(keyword, ("exact_text", "context"))
+        query = f"""
             SELECT e.id, e.category, e.exact_text, e.context,
                    e.page_number, e.confidence, e.marine_relevance,
                    e.metadata, d.filename, d.doc_type
             FROM extractions e
             JOIN documents d ON e.document_id = d.id
-            WHERE (e.exact_text LIKE ? COLLATE NOCASE
-                   OR e.context LIKE ? COLLATE NOCASE)
+            WHERE {text_filter}
         """
-        params: list = [like_pattern, like_pattern]
 
         if category is not None:
             query += " AND e.category = ?"
             params.append(category)
 
-        query += " ORDER BY e.confidence DESC LIMIT ?"
+        query += " ORDER BY e.confidence DESC, e.id LIMIT ?"
         params.append(limit)
 
-        rows = self.db.conn.execute(query, params).fetchall()
-        results = []
-        for row in rows:
-            d = dict(row)
-            if d.get("metadata"):
-                try:
-                    d["metadata"] = json.loads(d["metadata"])
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            results.append(d)
-        return results
+        return list(self.db.extraction_dicts(self.db.conn.execute(query, params)))
 
     # ------------------------------------------------------------------
     # Entity summaries
@@ -63,53 +61,12 @@ class QueryEngine:
         Returns a list of dicts with keys: species_name, mention_count,
         documents, avg_confidence.
         """
-        rows = self.db.conn.execute("""
-            SELECT e.metadata, e.exact_text, e.confidence, d.filename, d.doc_type
-            FROM extractions e
-            JOIN documents d ON e.document_id = d.id
-            WHERE e.category = 'species'
-            ORDER BY e.confidence DESC
-        """).fetchall()
-
-        species_map: Dict[str, dict] = {}
-        for row in rows:
-            # Try to get species_name from metadata, fall back to exact_text
-            name = None
-            if row["metadata"]:
-                try:
-                    meta = json.loads(row["metadata"])
-                    name = meta.get("species_name") or meta.get("name")
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            if not name:
-                name = (row["exact_text"] or "unknown").strip()
-
-            name_lower = name.lower()
-            if name_lower not in species_map:
-                species_map[name_lower] = {
-                    "species_name": name,
-                    "mention_count": 0,
-                    "documents": set(),
-                    "total_confidence": 0.0,
-                }
-            entry = species_map[name_lower]
-            entry["mention_count"] += 1
-            entry["documents"].add(row["filename"])
-            entry["total_confidence"] += (row["confidence"] or 0.0)
-
-        results = []
-        for entry in species_map.values():
-            count = entry["mention_count"]
-            results.append({
-                "species_name": entry["species_name"],
-                "mention_count": count,
-                "documents": sorted(entry["documents"]),
-                "avg_confidence": round(entry["total_confidence"] / count, 3)
-                                  if count else 0.0,
-            })
-
-        results.sort(key=lambda x: x["mention_count"], reverse=True)
-        return results
+        return [
+            {"species_name": name, "mention_count": count,
+             "documents": documents, "avg_confidence": avg_confidence}
+            for name, count, documents, avg_confidence
+            in self._entity_summary("species", "species_name")
+        ]
 
     def get_methods_summary(self) -> List[Dict]:
         """Get all methods with usage counts across documents.
@@ -117,52 +74,12 @@ class QueryEngine:
         Returns a list of dicts with keys: method_name, usage_count,
         documents, avg_confidence.
         """
-        rows = self.db.conn.execute("""
-            SELECT e.metadata, e.exact_text, e.confidence, d.filename
-            FROM extractions e
-            JOIN documents d ON e.document_id = d.id
-            WHERE e.category = 'methods'
-            ORDER BY e.confidence DESC
-        """).fetchall()
-
-        methods_map: Dict[str, dict] = {}
-        for row in rows:
-            name = None
-            if row["metadata"]:
-                try:
-                    meta = json.loads(row["metadata"])
-                    name = meta.get("method_name") or meta.get("name")
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            if not name:
-                name = (row["exact_text"] or "unknown").strip()
-
-            name_lower = name.lower()
-            if name_lower not in methods_map:
-                methods_map[name_lower] = {
-                    "method_name": name,
-                    "usage_count": 0,
-                    "documents": set(),
-                    "total_confidence": 0.0,
-                }
-            entry = methods_map[name_lower]
-            entry["usage_count"] += 1
-            entry["documents"].add(row["filename"])
-            entry["total_confidence"] += (row["confidence"] or 0.0)
-
-        results = []
-        for entry in methods_map.values():
-            count = entry["usage_count"]
-            results.append({
-                "method_name": entry["method_name"],
-                "usage_count": count,
-                "documents": sorted(entry["documents"]),
-                "avg_confidence": round(entry["total_confidence"] / count, 3)
-                                  if count else 0.0,
-            })
-
-        results.sort(key=lambda x: x["usage_count"], reverse=True)
-        return results
+        return [
+            {"method_name": name, "usage_count": count,
+             "documents": documents, "avg_confidence": avg_confidence}
+            for name, count, documents, avg_confidence
+            in self._entity_summary("methods", "method_name")
+        ]
 
     def get_legal_requirements_for_activity(self, activity: str) -> Dict:
         """Find distance, penalty, prohibition, and permit requirements
@@ -171,33 +88,23 @@ class QueryEngine:
         Searches across legal-type documents for extractions whose text
         mentions the activity keyword.
         """
-        like_pattern = f"%{activity}%"
+        result: Dict[str, list] = {cat: [] for cat in self.LEGAL_CATEGORIES}
 
-        categories = ["distances", "penalties", "prohibitions", "permits",
-                       "requirements", "regulations"]
-        result: Dict[str, list] = {cat: [] for cat in categories}
+        # One search over all categories, split up by category afterwards
+        text_filter, params = self._text_filter(activity, ("exact_text", "context"))
+        rows = self.db.extraction_dicts(self.db.conn.execute(f"""
+            SELECT e.id, e.category, e.exact_text, e.context, e.confidence,
+                   e.metadata, d.filename
+            FROM extractions e
+            JOIN documents d ON e.document_id = d.id
+            WHERE e.category IN ({", ".join("?" * len(self.LEGAL_CATEGORIES))})
+              AND d.doc_type = 'legal'
+              AND {text_filter}
+            ORDER BY e.confidence DESC, e.id
+        """, (*self.LEGAL_CATEGORIES, *params)))
 
-        for cat in categories:
-            rows = self.db.conn.execute("""
-                SELECT e.id, e.exact_text, e.context, e.confidence,
-                       e.metadata, d.filename
-                FROM extractions e
-                JOIN documents d ON e.document_id = d.id
-                WHERE e.category = ?
-                  AND d.doc_type = 'legal'
-                  AND (e.exact_text LIKE ? COLLATE NOCASE
-                       OR e.context LIKE ? COLLATE NOCASE)
-                ORDER BY e.confidence DESC
-            """, (cat, like_pattern, like_pattern)).fetchall()
-
-            for row in rows:
-                entry = dict(row)
-                if entry.get("metadata"):
-                    try:
-                        entry["metadata"] = json.loads(entry["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                result[cat].append(entry)
+        for entry in rows:
+            result[entry.pop("category")].append(entry)
 
         # Remove empty categories for cleaner output
         return {k: v for k, v in result.items() if v}
@@ -208,30 +115,19 @@ class QueryEngine:
         Searches exact_text, context, and metadata for the entity name
         and returns grouped results.
         """
-        like_pattern = f"%{entity_name}%"
+        text_filter, params = self._text_filter(
+            entity_name, ("exact_text", "context", "metadata"))
 
-        rows = self.db.conn.execute("""
+        rows = self.db.conn.execute(f"""
             SELECT e.id, e.category, e.exact_text, e.context,
                    e.page_number, e.confidence, e.metadata,
                    d.filename, d.doc_type
             FROM extractions e
             JOIN documents d ON e.document_id = d.id
-            WHERE e.exact_text LIKE ? COLLATE NOCASE
-               OR e.context LIKE ? COLLATE NOCASE
-               OR e.metadata LIKE ? COLLATE NOCASE
-            ORDER BY d.doc_type, e.confidence DESC
-        """, (like_pattern, like_pattern, like_pattern)).fetchall()
-
-        results = []
-        for row in rows:
-            d = dict(row)
-            if d.get("metadata"):
-                try:
-                    d["metadata"] = json.loads(d["metadata"])
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            results.append(d)
-        return results
+            WHERE {text_filter}
+            ORDER BY d.doc_type, e.confidence DESC, e.id
+        """, params)
+        return list(self.db.extraction_dicts(rows))
 
     # ------------------------------------------------------------------
     # Statistics
@@ -246,17 +142,14 @@ class QueryEngine:
 
         total_extractions = sum(ext_counts.values())
 
-        avg_confidence = self.db.conn.execute(
-            "SELECT AVG(confidence) AS avg FROM extractions"
-        ).fetchone()["avg"] or 0.0
-
-        cross_ref_count = self.db.conn.execute(
-            "SELECT COUNT(*) AS cnt FROM cross_references"
-        ).fetchone()["cnt"]
-
-        ik_count = self.db.conn.execute(
-            "SELECT COUNT(*) AS cnt FROM integrated_knowledge"
-        ).fetchone()["cnt"]
+        totals = self.db.conn.execute("""
+            SELECT (SELECT AVG(confidence) FROM extractions) AS avg_confidence,
+                   (SELECT COUNT(*) FROM cross_references) AS cross_refs,
+                   (SELECT COUNT(*) FROM integrated_knowledge) AS ik
+        """).fetchone()
+        avg_confidence = totals["avg_confidence"] or 0.0
+        cross_ref_count = totals["cross_refs"]
+        ik_count = totals["ik"]
 
         ik_by_type = self.db.conn.execute(
             """SELECT entity_type, COUNT(*) AS cnt
@@ -274,3 +167,73 @@ class QueryEngine:
                 row["entity_type"]: row["cnt"] for row in ik_by_type
             },
         }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _text_filter(self, text: str,
+                     columns: Tuple[str, ...]) -> Tuple[str, list]:
+        """SQL condition on extraction ``e`` for *columns* containing *text*.
+
+        Returns the condition and its parameters. The match is a
+        case-insensitive substring search: through the trigram full-text
+        index when the database has one, *text* is at least 3 characters
+        long and holds no LIKE wildcards (``%``, ``_``) that callers may rely
+        on; otherwise with LIKE over each column. The index is only read
+        here; if rows were added without KnowledgeDatabase.sync_fts() the
+        LIKE scan is used so that none are missed.
+
+        Both paths fold Unicode case (e.g. Turkish Ç/ç, Ş/ş), the trigram
+        tokenizer by itself and the LIKE scan through py_lower, so the rows
+        returned do not depend on which path is taken.
+        """
+        if (self.db.has_fts and len(text) >= 3 and not any(c in text for c in "%_")
+                and self.db.fts_is_current()):
+            phrase = '"' + text.replace('"', '""') + '"'
+            return (
+                "e.id IN (SELECT rowid FROM extractions_fts "
+                "WHERE extractions_fts MATCH ?)",
+                [f"{{{' '.join(columns)}}} : {phrase}"],
+            )
+        like_pattern = f"%{text.lower()}%"
+        condition = " OR ".join(f"py_lower(e.{column}) LIKE ?"
+                                for column in columns)
+        return f"({condition})", [like_pattern] * len(columns)
+
+    def _entity_summary(self, category: str,
+                        name_column: str) -> List[Tuple[str, int, List[str], float]]:
+        """Mentions of each entity of *category*, most mentioned first.
+
+        An entity is named by *name_column* or the metadata ``name``, else
+        by its stripped exact_text, and grouped case-insensitively under
+        the name of its highest-confidence mention. Returns
+        ``(name, count, sorted filenames, average confidence)`` tuples.
+        """
+        rows = self.db.conn.execute(f"""
+            SELECT name, COUNT(*) AS mentions, MIN(pos) AS first_pos,
+                   SUM(COALESCE(confidence, 0.0)) AS total_confidence,
+                   json_group_array(DISTINCT filename) AS documents
+            FROM (
+                SELECT COALESCE(
+                           NULLIF(e.{name_column}, ''),
+                           CASE WHEN json_valid(e.metadata)
+                                THEN NULLIF(json_extract(e.metadata, '$.name'), '') END,
+                           TRIM(COALESCE(NULLIF(e.exact_text, ''), 'unknown'),
+                                ' ' || char(9, 10, 11, 12, 13, 160))
+                       ) AS name,
+                       e.confidence, d.filename,
+                       ROW_NUMBER() OVER (ORDER BY e.confidence DESC, e.id) AS pos
+                FROM extractions e
+                JOIN documents d ON e.document_id = d.id
+                WHERE e.category = ?
+            )
+            GROUP BY py_lower(name)
+            ORDER BY mentions DESC, first_pos
+        """, (category,))
+
+        return [
+            (row["name"], row["mentions"], sorted(loads_json(row["documents"])),
+             round(row["total_confidence"] / row["mentions"], 3))
+            for row in rows
+        ]
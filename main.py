@@ -17,7 +17,7 @@ import os
 import sys
 import time
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter
 
 # Fix Windows console encoding for Turkish characters
 if sys.platform == "win32":
@@ -68,6 +68,9 @@ def parse_args():
                         help="Run validation after extraction")
     parser.add_argument("--ground-truth-dir", type=str, default=None,
                         help="Directory with annotated validation CSVs (for metrics calculation)")
+    parser.add_argument("--workers", "--num-workers", type=int, default=None,
+                        help="Worker processes for PDF extraction (default: CPU count, "
+                             "at most 8; 1 = sequential)")
     return parser.parse_args()
 
 
@@ -75,11 +78,11 @@ def discover_pdfs(directory):
     """Find all PDF files in a directory."""
     if not directory or not os.path.isdir(directory):
         return []
-    pdfs = []
-    for fname in sorted(os.listdir(directory)):
-        if fname.lower().endswith(".pdf"):
-            pdfs.append(os.path.join(directory, fname))
-    return pdfs
+    # DirEntry.is_file() is answered from the directory listing itself, so
+    # this needs no stat call per file (symlinks are still followed)
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries
+                      if entry.name.lower().endswith(".pdf") and entry.is_file())
 
 
 def _process_single_pdf(args):
@@ -102,54 +105,79 @@ def _process_single_pdf(args):
         return fname, {"error": str(e)}, f"ERROR: {e}"
 
 
-def process_documents(pdf_paths, processor, label):
-    """Process a list of PDFs with a given processor, using thread-based parallelism."""
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+def process_documents(groups, workers=None):
+    """Process groups of PDFs, each with its own processor.
 
-    processor_class = type(processor)
-    num_workers = min(os.cpu_count() or 4, len(pdf_paths), 8)
+    *groups* is a list of ``(pdf_paths, processor, label)`` tuples. Text
+    extraction and the regex extractors are CPU-bound, so PDFs are spread
+    over worker processes rather than threads, which the GIL would
+    serialise. All groups share one pool, so workers are not left idle
+    while the last PDFs of one group finish. *workers* defaults to the CPU
+    count, capped at 8.
 
-    all_results = {}
+    Results are merged in group order: a filename that appears in two
+    groups keeps the result of the later one.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    total = sum(len(pdf_paths) for pdf_paths, _, _ in groups)
+    num_workers = min(workers or min(os.cpu_count() or 4, 8), total)
 
-    if num_workers > 1 and len(pdf_paths) > 2:
-        print(f"  Using {num_workers} parallel workers...")
-        work_items = [(pdf_path, processor_class) for pdf_path in pdf_paths]
+    group_results = [{} for _ in groups]
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = {executor.submit(_process_single_pdf, item): item for item in work_items}
+    if num_workers > 1 and total > 2:
+        print(f"  Using {num_workers} worker processes...")
+        # Largest files first, so a big PDF picked up last does not leave
+        # one worker running long after the others have gone idle
+        work_items = sorted(
+            ((pdf_path, type(processor), index)
+             for index, (pdf_paths, processor, _) in enumerate(groups)
+             for pdf_path in pdf_paths),
+            key=lambda item: os.path.getsize(item[0]), reverse=True)
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            futures = {executor.submit(_process_single_pdf, (pdf_path, processor_class)): index
+                       for pdf_path, processor_class, index in work_items}
             for i, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                label = groups[index][2]
                 fname, results, info = future.result()
                 if results is None:
-                    print(f"  [{i}/{len(pdf_paths)}] {fname}: WARNING - {info}, skipping.")
+                    print(f"  [{i}/{total}] {label}: {fname}: WARNING - {info}, skipping.")
                 elif isinstance(results, dict) and "error" in results:
-                    print(f"  [{i}/{len(pdf_paths)}] {fname}: {info}")
-                    all_results[fname] = results
+                    print(f"  [{i}/{total}] {label}: {fname}: {info}")
+                    group_results[index][fname] = results
                 else:
-                    print(f"  [{i}/{len(pdf_paths)}] {fname}: {info} items extracted")
-                    all_results[fname] = results
+                    print(f"  [{i}/{total}] {label}: {fname}: {info} items extracted")
+                    group_results[index][fname] = results
     else:
         # Fallback to sequential for small batches
-        for i, pdf_path in enumerate(pdf_paths, 1):
-            fname = os.path.basename(pdf_path)
-            print(f"  [{i}/{len(pdf_paths)}] Processing {fname}...")
+        for (pdf_paths, processor, label), results_by_name in zip(groups, group_results):
+            print(f"\n  Processing {len(pdf_paths)} {label} PDFs...")
+            for i, pdf_path in enumerate(pdf_paths, 1):
+                fname = os.path.basename(pdf_path)
+                print(f"  [{i}/{len(pdf_paths)}] Processing {fname}...")
 
-            try:
-                full_text, page_texts = extract_text_from_pdf(pdf_path)
-                if not full_text or len(full_text.strip()) < 50:
-                    print(f"    WARNING: Insufficient text extracted from {fname}, skipping.")
-                    continue
+                try:
+                    full_text, page_texts = extract_text_from_pdf(pdf_path)
+                    if not full_text or len(full_text.strip()) < 50:
+                        print(f"    WARNING: Insufficient text extracted from {fname}, skipping.")
+                        continue
 
-                doc_type = LanguageDetector.detect(full_text)
-                results = processor.process(full_text, page_texts, doc_type, source_file=fname)
-                all_results[fname] = results
+                    doc_type = LanguageDetector.detect(full_text)
+                    results = processor.process(full_text, page_texts, doc_type, source_file=fname)
+                    results_by_name[fname] = results
 
-                total = sum(len(v) for v in results.values() if isinstance(v, list))
-                print(f"    Extracted {total} items across {len(results)} categories")
+                    total_items = sum(len(v) for v in results.values() if isinstance(v, list))
+                    print(f"    Extracted {total_items} items across {len(results)} categories")
 
-            except Exception as e:
-                print(f"    ERROR processing {fname}: {e}")
-                all_results[fname] = {"error": str(e)}
+                except Exception as e:
+                    print(f"    ERROR processing {fname}: {e}")
+                    results_by_name[fname] = {"error": str(e)}
 
+    all_results = {}
+    for results_by_name in group_results:
+        all_results.update(results_by_name)
     return all_results
 
 
@@ -187,25 +215,15 @@ def run_pipeline(args):
 
     # ── Phase 2: Extraction ──
     print("\n[Phase 2] Running extractors...")
-    all_results = {}
-
+    groups = []
     if research_pdfs:
-        print(f"\n  Processing {len(research_pdfs)} research papers...")
-        research_processor = Q1PaperProcessor()
-        research_results = process_documents(research_pdfs, research_processor, "research")
-        all_results.update(research_results)
-
+        groups.append((research_pdfs, Q1PaperProcessor(), "research"))
     if legal_pdfs:
-        print(f"\n  Processing {len(legal_pdfs)} legal documents...")
-        legal_processor = LegalDocumentProcessor()
-        legal_results = process_documents(legal_pdfs, legal_processor, "legal")
-        all_results.update(legal_results)
-
+        groups.append((legal_pdfs, LegalDocumentProcessor(), "legal"))
     if dataset_pdfs:
-        print(f"\n  Processing {len(dataset_pdfs)} dataset files...")
-        dataset_processor = DatasetProcessor()
-        dataset_results = process_documents(dataset_pdfs, dataset_processor, "dataset")
-        all_results.update(dataset_results)
+        groups.append((dataset_pdfs, DatasetProcessor(), "dataset"))
+
+    all_results = process_documents(groups, workers=args.workers)
 
     # Save raw results
     raw_path = os.path.join(output_dir, f"raw_results_{timestamp}.json")
@@ -222,32 +240,38 @@ def run_pipeline(args):
     print("\n[Phase 3] Building knowledge base...")
     kb = KnowledgeDatabase(db_path)
 
-    builder = KnowledgeBuilder(kb)
-    # Ingest from result directories if they exist, otherwise from raw results
-    if args.research_dir:
-        builder.ingest_results_directory(args.research_dir, "SCIENTIFIC_ENGLISH")
-    if args.legal_dir:
-        builder.ingest_results_directory(args.legal_dir, "LEGAL_TURKISH")
+    # Result files in the input directories are only used when this run
+    # produced nothing; otherwise all_results already holds the extractions
+    if not all_results:
+        builder = KnowledgeBuilder(kb)
+        if args.research_dir:
+            builder.ingest_results_directory(args.research_dir, "SCIENTIFIC_ENGLISH")
+        if args.legal_dir:
+            builder.ingest_results_directory(args.legal_dir, "LEGAL_TURKISH")
 
-    # Also ingest the current run's results directly
+    # Ingest the current run's results directly
     research_files = {os.path.basename(p) for p in research_pdfs}
     legal_files = {os.path.basename(p) for p in legal_pdfs}
-    for doc_name, doc_results in all_results.items():
-        if isinstance(doc_results, dict) and "error" not in doc_results:
-            if doc_name in legal_files:
-                d_type, d_lang = "LEGAL_TURKISH", "turkish"
-            else:
-                d_type, d_lang = "SCIENTIFIC_ENGLISH", "english"
-            doc_id = kb.insert_document(doc_name, doc_type=d_type, language=d_lang,
-                                        pages=0, source_path=doc_name)
-            for category, items in doc_results.items():
-                if isinstance(items, list):
-                    kb.insert_batch_extractions(doc_id, category, items)
+    with kb.transaction():
+        for doc_name, doc_results in all_results.items():
+            if isinstance(doc_results, dict) and "error" not in doc_results:
+                if doc_name in legal_files:
+                    d_type, d_lang = "LEGAL_TURKISH", "turkish"
+                else:
+                    d_type, d_lang = "SCIENTIFIC_ENGLISH", "english"
+                doc_id = kb.insert_document(doc_name, doc_type=d_type, language=d_lang,
+                                            pages=0, source_path=doc_name)
+                kb.insert_batch_extractions_multi(doc_id, {
+                    category: items for category, items in doc_results.items()
+                    if isinstance(items, list)
+                })
 
     # Cross-link
     print("  Cross-linking knowledge...")
     linker = CrossLinker(kb)
     linker.link_all()
+    kb.analyze()
+    kb.sync_fts()
 
     summary = kb.get_document_summary()
     print(f"  KB: {summary.get('total_documents', 0)} documents, "
@@ -283,10 +307,7 @@ def run_pipeline(args):
         gaps = prioritizer.prioritize(gaps)
 
         print(f"  Total gaps identified: {len(gaps)}")
-        severity_counts = defaultdict(int)
-        for g in gaps:
-            sev = getattr(g, "severity", None) or (g.get("severity") if isinstance(g, dict) else "unknown")
-            severity_counts[sev] += 1
+        severity_counts = Counter(g.severity for g in gaps)
         for sev, count in sorted(severity_counts.items()):
             print(f"    {sev}: {count}")
 
@@ -3,9 +3,25 @@ Export utilities - CSV, JSON, and Excel export for extraction results.
 """
 
 import csv
+import dataclasses
 import json
 import os
 from collections import defaultdict
+from itertools import chain
+
+
+def _fieldnames(rows):
+    """Union of the keys of *rows*, in order of first appearance."""
+    return list(dict.fromkeys(chain.from_iterable(rows)))
+
+
+def _dataclass_row(item):
+    """Field name -> value of a dataclass instance, for one export row.
+
+    A shallow replacement for dataclasses.asdict, which deep-copies every
+    field; rows are only written out, so the copy is not needed.
+    """
+    return {f.name: getattr(item, f.name) for f in dataclasses.fields(item)}
 
 
 def export_to_csv(results, output_path):
@@ -23,8 +39,7 @@ def export_to_csv(results, output_path):
                             if isinstance(item, dict):
                                 row.update(item)
                             elif hasattr(item, "__dataclass_fields__"):
-                                import dataclasses
-                                row.update(dataclasses.asdict(item))
+                                row.update(_dataclass_row(item))
                             else:
                                 row["value"] = str(item)
                             rows.append(row)
@@ -33,14 +48,7 @@ def export_to_csv(results, output_path):
         print("No data to export.")
         return None
 
-    # Collect all field names
-    fieldnames = []
-    seen = set()
-    for row in rows:
-        for key in row.keys():
-            if key not in seen:
-                fieldnames.append(key)
-                seen.add(key)
+    fieldnames = _fieldnames(rows)
 
     with open(output_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
@@ -88,8 +96,7 @@ def export_to_excel(results, output_path):
                             if isinstance(item, dict):
                                 row.update(item)
                             elif hasattr(item, "__dataclass_fields__"):
-                                import dataclasses
-                                row.update(dataclasses.asdict(item))
+                                row.update(_dataclass_row(item))
                             else:
                                 row["value"] = str(item)
                             by_category[category].append(row)
@@ -107,13 +114,7 @@ def export_to_excel(results, output_path):
         ws = wb.create_sheet(sheet_name)
 
         # Headers
-        fieldnames = []
-        seen = set()
-        for row in rows:
-            for key in row.keys():
-                if key not in seen:
-                    fieldnames.append(key)
-                    seen.add(key)
+        fieldnames = _fieldnames(rows)
 
         ws.append(fieldnames)
 
@@ -137,20 +138,13 @@ def export_gaps_to_csv(gaps, output_path):
     rows = []
     for gap in gaps:
         if hasattr(gap, "__dataclass_fields__"):
-            import dataclasses
-            rows.append(dataclasses.asdict(gap))
+            rows.append(_dataclass_row(gap))
         elif isinstance(gap, dict):
             rows.append(gap)
         else:
             rows.append({"description": str(gap)})
 
-    fieldnames = []
-    seen = set()
-    for row in rows:
-        for key in row.keys():
-            if key not in seen:
-                fieldnames.append(key)
-                seen.add(key)
+    fieldnames = _fieldnames(rows)
 
     with open(output_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
@@ -1,8 +1,13 @@
 """
 Generate beautiful PDF reports for the MSP Knowledge Extraction System.
 Produces: (1) Progress Report PDF, (2) Email PDF
+
+Requires fpdf2 (``pip install fpdf2``), which keeps the output buffer in a
+bytearray. The legacy pyfpdf package also installs as ``fpdf`` but lacks the
+new_x/new_y API used here.
 """
 import sys
+from itertools import cycle
 from pathlib import Path
 
 if sys.platform == "win32":
@@ -13,64 +18,75 @@ from fpdf import FPDF
 PROJECT_ROOT = Path(__file__).parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "paper_assets"
 
+# Shared style colours (RGB)
+PRIMARY = (0, 82, 133)
+ACCENT = (0, 102, 153)
+BODY = (40, 40, 40)
+MUTED = (100, 100, 100)
+
 
 class MSPReport(FPDF):
     """Custom PDF with header/footer styling."""
 
+    # The helpers below set their font and colours unconditionally. fpdf2
+    # already ignores a set_font() for the selected font and only writes a
+    # fill colour operator when the colour changes, so caching that state
+    # here would not remove anything from the content stream.
+
     def __init__(self):
         super().__init__()
         self.set_auto_page_break(auto=True, margin=25)
 
     def header(self):
         self.set_font("Helvetica", "I", 8)
-        self.set_text_color(100, 100, 100)
+        self.set_text_color(*MUTED)
         self.cell(0, 5, "MSP Knowledge Extraction System - Progress Report", align="R")
         self.ln(3)
-        self.set_draw_color(0, 102, 153)
+        self.set_draw_color(*ACCENT)
         self.set_line_width(0.5)
         self.line(10, 12, 200, 12)
         self.ln(5)
 
     def footer(self):
         self.set_y(-20)
-        self.set_draw_color(0, 102, 153)
+        self.set_draw_color(*ACCENT)
         self.set_line_width(0.3)
         self.line(10, self.get_y(), 200, self.get_y())
         self.ln(3)
         self.set_font("Helvetica", "I", 8)
-        self.set_text_color(100, 100, 100)
+        self.set_text_color(*MUTED)
         self.cell(0, 5, f"Page {self.page_no()}/{{nb}}", align="C")
 
     def section_title(self, num, title):
         self.set_font("Helvetica", "B", 14)
-        self.set_text_color(0, 82, 133)
+        self.set_text_color(*PRIMARY)
         self.cell(0, 10, f"{num}. {title}", new_x="LMARGIN", new_y="NEXT")
-        self.set_draw_color(0, 102, 153)
+        self.set_draw_color(*ACCENT)
         self.set_line_width(0.3)
         self.line(10, self.get_y(), 120, self.get_y())
         self.ln(3)
 
     def subsection_title(self, title):
         self.set_font("Helvetica", "B", 11)
-        self.set_text_color(0, 102, 153)
+        self.set_text_color(*ACCENT)
         self.cell(0, 8, title, new_x="LMARGIN", new_y="NEXT")
         self.ln(1)
 
     def body_text(self, text):
         self.set_font("Helvetica", "", 10)
-        self.set_text_color(40, 40, 40)
+        self.set_text_color(*BODY)
         self.multi_cell(0, 5.5, text)
         self.ln(2)
 
     def bold_text(self, text):
         self.set_font("Helvetica", "B", 10)
-        self.set_text_color(40, 40, 40)
+        self.set_text_color(*BODY)
         self.multi_cell(0, 5.5, text)
         self.ln(1)
 
     def bullet(self, text):
         self.set_font("Helvetica", "", 10)
-        self.set_text_color(40, 40, 40)
+        self.set_text_color(*BODY)
         self.set_x(10)
         self.multi_cell(0, 5.5, "  - " + text)
 
@@ -82,30 +98,23 @@ class MSPReport(FPDF):
 
         # Header
         self.set_font("Helvetica", "B", 9)
-        self.set_fill_color(0, 82, 133)
+        self.set_fill_color(*PRIMARY)
         self.set_text_color(255, 255, 255)
-        for i, h in enumerate(headers):
-            self.cell(col_widths[i], 7, h, border=1, fill=True, align="C")
+        for width, h in zip(col_widths, headers):
+            self.cell(width, 7, h, border=1, fill=True, align="C")
         self.ln()
 
-        # Rows
+        # Rows, alternating white and light blue fills
         self.set_font("Helvetica", "", 9)
-        self.set_text_color(40, 40, 40)
-        fill = False
-        for row in rows:
-            if fill:
-                self.set_fill_color(235, 243, 248)
-            else:
-                self.set_fill_color(255, 255, 255)
-
-            max_h = 7
-            for i, cell in enumerate(row):
-                self.cell(col_widths[i], max_h, str(cell)[:50], border=1, fill=True, align="C")
+        self.set_text_color(*BODY)
+        for row, fill_color in zip(rows, cycle(((255, 255, 255), (235, 243, 248)))):
+            self.set_fill_color(*fill_color)
+            for width, cell in zip(col_widths, row):
+                self.cell(width, 7, str(cell)[:50], border=1, fill=True, align="C")
             self.ln()
-            fill = not fill
         self.ln(3)
 
-    def key_metric_box(self, label, value, color=(0, 82, 133)):
+    def key_metric_box(self, label, value, color=PRIMARY):
         """Draw a highlighted metric box."""
         self.set_fill_color(*color)
         self.set_text_color(255, 255, 255)
@@ -128,7 +137,7 @@ def generate_progress_report():
 
     # Title page
     pdf.set_font("Helvetica", "B", 24)
-    pdf.set_text_color(0, 82, 133)
+    pdf.set_text_color(*PRIMARY)
     pdf.ln(20)
     pdf.cell(0, 15, "MSP Knowledge Extraction", align="C", new_x="LMARGIN", new_y="NEXT")
     pdf.cell(0, 15, "System", align="C", new_x="LMARGIN", new_y="NEXT")
@@ -137,7 +146,7 @@ def generate_progress_report():
     pdf.set_text_color(80, 80, 80)
     pdf.cell(0, 10, "Progress Report", align="C", new_x="LMARGIN", new_y="NEXT")
     pdf.ln(5)
-    pdf.set_draw_color(0, 102, 153)
+    pdf.set_draw_color(*ACCENT)
     pdf.set_line_width(1)
     pdf.line(60, pdf.get_y(), 150, pdf.get_y())
     pdf.ln(10)
@@ -413,9 +422,9 @@ def generate_email_pdf():
 
     # Header
     pdf.set_font("Helvetica", "B", 14)
-    pdf.set_text_color(0, 82, 133)
+    pdf.set_text_color(*PRIMARY)
     pdf.cell(0, 10, "Email to Professors", align="C", new_x="LMARGIN", new_y="NEXT")
-    pdf.set_draw_color(0, 102, 153)
+    pdf.set_draw_color(*ACCENT)
     pdf.set_line_width(0.5)
     pdf.line(10, pdf.get_y(), 200, pdf.get_y())
     pdf.ln(8)
@@ -450,7 +459,7 @@ def generate_email_pdf():
     # Body
     W = 190
     pdf.set_font("Helvetica", "", 11)
-    pdf.set_text_color(40, 40, 40)
+    pdf.set_text_color(*BODY)
 
     pdf.set_x(10); pdf.multi_cell(W, 6, "Dear Manuel and Mateo,")
     pdf.ln(3)
@@ -462,19 +471,23 @@ def generate_email_pdf():
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_x(10); pdf.multi_cell(W, 7, "Summary of work completed since January:")
     pdf.set_font("Helvetica", "", 10)
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Built a complete NLP extraction system: 67 Python files, 21 specialized extractors, multi-stage filtering pipeline")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Processed 273 documents (248 English research papers + 25 Turkish legal texts)")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Extracted 6,914 structured knowledge items across 21 categories")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Full validation: precision (795 samples), recall (10-doc gold standard), baseline comparison, ablation study, error analysis")
+    pdf.set_x(10); pdf.multi_cell(W, 6, "\n".join([
+        "  - Built a complete NLP extraction system: 67 Python files, 21 specialized extractors, multi-stage filtering pipeline",
+        "  - Processed 273 documents (248 English research papers + 25 Turkish legal texts)",
+        "  - Extracted 6,914 structured knowledge items across 21 categories",
+        "  - Full validation: precision (795 samples), recall (10-doc gold standard), baseline comparison, ablation study, error analysis",
+    ]))
     pdf.ln(3)
 
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_x(10); pdf.multi_cell(W, 7, "Key results:")
     pdf.set_font("Helvetica", "", 10)
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Turkish legal extraction: legal references 95.7% precision, protected areas 90.5%")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Stakeholder identification: 82.0%, research methods: 66.0%")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - 83% noise reduction compared to simple keyword matching")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  - Overall F1: 0.180 (low recall is the main limitation of the rule-based approach)")
+    pdf.set_x(10); pdf.multi_cell(W, 6, "\n".join([
+        "  - Turkish legal extraction: legal references 95.7% precision, protected areas 90.5%",
+        "  - Stakeholder identification: 82.0%, research methods: 66.0%",
+        "  - 83% noise reduction compared to simple keyword matching",
+        "  - Overall F1: 0.180 (low recall is the main limitation of the rule-based approach)",
+    ]))
     pdf.ln(3)
 
     pdf.set_font("Helvetica", "B", 11)
@@ -491,9 +504,11 @@ def generate_email_pdf():
     pdf.set_font("Helvetica", "B", 11)
     pdf.set_x(10); pdf.multi_cell(W, 7, "I would appreciate your guidance on:")
     pdf.set_font("Helvetica", "", 10)
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  1. Do you agree with the hybrid approach (rule-based + LLM) for the Q1 paper?")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  2. For the AEIPRO conference paper (deadline March 28): should I focus on methodology and Turkish case study, keeping the full evaluation for Q1?")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "  3. Which Q1 journal should we target? (I have included Renewable and Sustainable Energy Reviews in the corpus as you suggested.)")
+    pdf.set_x(10); pdf.multi_cell(W, 6, "\n".join([
+        "  1. Do you agree with the hybrid approach (rule-based + LLM) for the Q1 paper?",
+        "  2. For the AEIPRO conference paper (deadline March 28): should I focus on methodology and Turkish case study, keeping the full evaluation for Q1?",
+        "  3. Which Q1 journal should we target? (I have included Renewable and Sustainable Energy Reviews in the corpus as you suggested.)",
+    ]))
     pdf.ln(3)
 
     pdf.set_x(10); pdf.multi_cell(W, 6,
@@ -501,8 +516,7 @@ def generate_email_pdf():
         "I am ready to schedule a meeting at your convenience to discuss the path forward."
     )
     pdf.ln(5)
-    pdf.set_x(10); pdf.multi_cell(W, 6, "Best regards,")
-    pdf.set_x(10); pdf.multi_cell(W, 6, "Ahsan")
+    pdf.set_x(10); pdf.multi_cell(W, 6, "Best regards,\nAhsan")
 
     output_path = OUTPUT_DIR / "Email_to_Professors_2026-02-17.pdf"
     pdf.output(str(output_path))
@@ -0,0 +1,51 @@
+"""
+Text search in QueryEngine must return the same rows whether it goes through
+the trigram full-text index or the LIKE fallback.
+"""
+
+import pytest
+
+from knowledge_base import KnowledgeDatabase, QueryEngine
+
+
+TEXT = "Çevre ve ŞEHİRCİLİK Bakanlığı"
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = KnowledgeDatabase(str(tmp_path / "kb.db"))
+    doc_id = db.insert_document("mevzuat.pdf", doc_type="legal",
+                                language="turkish", pages=1)
+    db.insert_extraction(doc_id, "permits", {
+        "exact_text": TEXT,
+        "context": "izin " + TEXT,
+        "confidence": 0.9,
+    })
+    db.insert_extraction(doc_id, "permits", {
+        "exact_text": "marine spatial planning",
+        "confidence": 0.5,
+    })
+    yield db
+    db.close()
+
+
+def _searches(query, keyword):
+    return (
+        [r["exact_text"] for r in query.search_extractions(keyword)],
+        [r["exact_text"] for r in query.get_cross_document_entities(keyword)],
+        {cat: [r["exact_text"] for r in rows] for cat, rows in
+         query.get_legal_requirements_for_activity(keyword).items()},
+    )
+
+
+@pytest.mark.parametrize("keyword", ["çevre", "ÇEVRE", "ŞEHİRCİLİK", "bakanlığı"])
+def test_non_ascii_search_same_before_and_after_sync(db, keyword):
+    query = QueryEngine(db)
+
+    # Index not yet synced: the LIKE fallback is used
+    before = _searches(query, keyword)
+    assert before == ([TEXT], [TEXT], {"permits": [TEXT]})
+
+    db.sync_fts()
+    after = _searches(query, keyword)
+    assert after == before
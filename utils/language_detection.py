@@ -65,7 +65,7 @@ class LanguageDetector:
         text_lower = text_sample.lower()
 
         # Check Turkish character ratio
-        turkish_chars = sum(1 for c in text_sample if c in cls.TURKISH_CHARS)
+        turkish_chars = sum(map(text_sample.count, cls.TURKISH_CHARS))
         turkish_ratio = turkish_chars / len(text_sample) if text_sample else 0
         is_turkish = turkish_ratio > TURKISH_CHAR_THRESHOLD
 